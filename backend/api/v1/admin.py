@@ -3,6 +3,7 @@ from typing import List
 from backend.api.v1.auth import require_role, get_current_user
 from backend.services.admin_service import AdminService
 from backend.schemas.admin import UserCreate, UserResponse, LogResponse
+from backend.database import get_db
 
 router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_role(["Admin"]))])
 
@@ -34,5 +35,9 @@ def delete_existing_user(user_id: int, current_user: dict = Depends(get_current_
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/logs", response_model=List[LogResponse])
-def view_logs(service: AdminService = Depends(get_service)):
-    return service.get_logs()
+def view_logs(service: AdminService = Depends(get_service), conn = Depends(get_db)):
+    return service.get_logs(conn)
+
+@router.get("/cache-stats")
+def view_cache_stats(service: AdminService = Depends(get_service)):
+    return service.get_cache_stats()
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends, Request, Form
+from fastapi import APIRouter, HTTPException, Depends, Request, Form, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from backend.database import get_db_connection
 from backend.api.v1.auth import get_current_user
 from backend.services.attendance_service import AttendanceService
+from backend.services.calendar_service import CalendarService
 from backend.schemas.attendance import (
     ClockOutRequest, LeaveRequest, AttendanceStatus, 
-    LeaveBalance, LeaveRecord, AttendanceRecord
+    LeaveBalance, LeaveRecord, AttendanceRecord, BulkLeaveActionRequest, HolidayRequest
 )
 
 router = APIRouter(prefix="/api/attendance", tags=["Attendance"])
@@ -103,8 +105,66 @@ def approve_reject_leave(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/leave/bulk-action")
+def bulk_approve_reject_leaves(req: BulkLeaveActionRequest, user=Depends(get_current_user), service: AttendanceService = Depends(get_service)):
+    if user['role'] not in ['Admin', 'HR', 'Management']:
+         raise HTTPException(status_code=403, detail="Not authorized")
+
+    if req.action not in ['Approved', 'Rejected']:
+         raise HTTPException(status_code=400, detail="Invalid action")
+
+    try:
+        return service.bulk_approve_reject_leaves(req.leave_ids, req.action, req.reason, user['role'], user.get('employee_code'))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/admin/summary")
-def get_monthly_attendance_summary(year: int, month: int, user=Depends(get_current_user), service: AttendanceService = Depends(get_service)):
+def get_monthly_attendance_summary(
+    year: int,
+    month: int = Query(..., ge=1, le=12),
+    format: str = Query("full", pattern="^(full|compact)$"),
+    user=Depends(get_current_user),
+    service: AttendanceService = Depends(get_service)
+):
     if user['role'] not in ['Admin', 'HR', 'Management']:
          raise HTTPException(status_code=403, detail="Not authorized")
-    return service.get_monthly_summary(year, month)
+    try:
+        chunks = service.stream_monthly_summary(year, month, compact=(format == "compact"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(chunks, media_type="application/json")
+
+# --- Holiday Calendar Endpoints ---
+
+def get_calendar_service():
+    return CalendarService()
+
+@router.get("/holidays")
+def list_holidays(year: Optional[int] = None, location: Optional[str] = None,
+                  user=Depends(get_current_user), service: CalendarService = Depends(get_calendar_service)):
+    return service.list_holidays(year, location)
+
+@router.post("/holidays")
+def add_holiday(req: HolidayRequest, user=Depends(get_current_user), service: CalendarService = Depends(get_calendar_service)):
+    if user['role'] not in ['Admin', 'HR']:
+         raise HTTPException(status_code=403, detail="Not authorized")
+    try:
+        return service.add_holiday(req.date, req.name, req.location)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/holidays/{day}")
+def remove_holiday(day: str, location: Optional[str] = None,
+                   user=Depends(get_current_user), service: CalendarService = Depends(get_calendar_service)):
+    if user['role'] not in ['Admin', 'HR']:
+         raise HTTPException(status_code=403, detail="Not authorized")
+    try:
+        return service.remove_holiday(day, location)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, Response, Request, Depends
 from backend.services.auth_service import AuthService
+from backend.core.password_hasher import HasherBusy
 from backend.schemas.auth import LoginRequest
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
@@ -12,9 +13,19 @@ def get_service():
 # BUT, other routers currently import 'backend.routers.auth.get_current_user' and 'backend.routers.auth.require_role'
 # So we must expose them here with the exact same names to avoid breaking changes in other files during this phase.
 
-def get_current_user(request: Request, service: AuthService = Depends(get_service)):
-    session_token = request.cookies.get("session_token")
-    user = service.get_session_user(session_token)
+_UNRESOLVED = object()
+
+def resolve_request_user(request: Request):
+    # Populated once per request by AuthContextMiddleware; fall back to a
+    # direct lookup if the middleware isn't installed (e.g. a bare router in tests).
+    user = getattr(request.state, "user", _UNRESOLVED)
+    if user is _UNRESOLVED:
+        user = get_service().get_session_user(request.cookies.get("session_token"))
+        request.state.user = user
+    return user
+
+def get_current_user(request: Request):
+    user = resolve_request_user(request)
     
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated or session expired")
@@ -34,9 +45,9 @@ def require_role(allowed_roles: list[str]):
 # --- Endpoints ---
 
 @router.post("/login")
-def login(credentials: LoginRequest, response: Response, service: AuthService = Depends(get_service)):
+async def login(credentials: LoginRequest, response: Response, service: AuthService = Depends(get_service)):
     try:
-        result = service.login(credentials.username, credentials.password)
+        result = await service.login_async(credentials.username, credentials.password)
         if not result:
             raise HTTPException(status_code=401, detail="Invalid username or password")
         
@@ -55,6 +66,10 @@ def login(credentials: LoginRequest, response: Response, service: AuthService =
             "message": "Login successful",
             "user": result['user']
         }
+    except HTTPException:
+        raise
+    except HasherBusy as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
     except ValueError as e: # Account deactivated
         raise HTTPException(status_code=403, detail=str(e))
     except Exception as e:
@@ -66,6 +81,7 @@ def logout(request: Request, response: Response, service: AuthService = Depends(
     if token:
         service.logout(token)
     
+    request.state.user = None
     response.delete_cookie("session_token", path="/", samesite="lax")
     return {"success": True, "message": "Logged out successfully"}
 
@@ -77,9 +93,8 @@ def get_me(current_user: dict = Depends(get_current_user)):
     }
 
 @router.get("/check")
-def check_auth(request: Request, service: AuthService = Depends(get_service)):
-    token = request.cookies.get("session_token")
-    user = service.get_session_user(token)
+def check_auth(request: Request):
+    user = resolve_request_user(request)
     
     if not user:
         return {"authenticated": False}
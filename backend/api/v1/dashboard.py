@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from backend.api.v1.auth import require_role, get_current_user
 from backend.services.dashboard_service import DashboardService
 
@@ -7,10 +8,20 @@ router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 def get_service():
     return DashboardService()
 
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return "*" in candidates or etag in [t[2:] if t.startswith("W/") else t for t in candidates]
+
 @router.get("/stats", dependencies=[Depends(require_role(["Admin", "HR", "Management"]))])
-def get_dashboard_stats(service: DashboardService = Depends(get_service)):
+def get_dashboard_stats(request: Request, service: DashboardService = Depends(get_service)):
     try:
-        return service.get_admin_stats()
+        stats, etag = service.get_cached_admin_stats()
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(stats, headers=headers)
     except Exception as e:
         print(f"Admin Dashboard Error: {e}")
         # In production log real error, generic return
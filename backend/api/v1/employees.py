@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends, Form, File, UploadFile, Body
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Form, File, UploadFile, Body, Query
+from typing import List, Optional
 from backend.api.v1.auth import require_role, get_current_user
 from backend.services.employee_service import EmployeeService
 from backend.schemas.employee import UpdateEmployeeRequest, OffboardRequest
@@ -13,8 +13,31 @@ def get_service():
     return EmployeeService()
 
 @router.get("/employees", dependencies=[Depends(require_role(["Admin", "HR", "Management", "Employee"]))])
-def get_employees(service: EmployeeService = Depends(get_service)):
-    return service.get_all_employees()
+def get_employees(
+    team: Optional[str] = None,
+    status: Optional[str] = None,
+    designation: Optional[str] = None,
+    manager: Optional[str] = None,
+    location: Optional[str] = None,
+    sort: str = "name",
+    order: str = "asc",
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    service: EmployeeService = Depends(get_service)
+):
+    filters = {"team": team, "status": status, "designation": designation, "manager": manager, "location": location}
+    try:
+        return service.list_employees(filters, sort, order, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/employees/search", dependencies=[Depends(require_role(["Admin", "HR", "Management", "Employee"]))])
+def search_employees(
+    q: str = Query(..., min_length=1),
+    limit: Optional[int] = Query(None, ge=1),
+    service: EmployeeService = Depends(get_service)
+):
+    return service.search_employees(q, limit)
 
 @router.get("/employee/{employee_code}", dependencies=[Depends(require_role(["Admin", "HR", "Management", "Employee"]))])
 def get_employee(employee_code: str, service: EmployeeService = Depends(get_service)):
@@ -0,0 +1,34 @@
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import HTTPConnection
+
+from backend.core.session_store import get_session_store
+
+SESSION_COOKIE = "session_token"
+
+
+class AuthContextMiddleware:
+    """Resolve the session cookie once per request into `request.state.user`.
+
+    Cached sessions are answered inline; a cache miss goes to the session
+    store on the threadpool so the event loop never blocks on SQLite.
+    `request.state.user` is None for anonymous or expired sessions.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        user = None
+        token = HTTPConnection(scope).cookies.get(SESSION_COOKIE)
+        if token:
+            store = get_session_store()
+            user = store.peek(token)
+            if user is None:
+                user = await run_in_threadpool(store.load, token)
+
+        scope.setdefault("state", {})["user"] = user
+        await self.app(scope, receive, send)
@@ -0,0 +1,37 @@
+"""Tiny in-process publish/subscribe hub.
+
+Repositories publish a topic after committing a write; caches subscribe to
+drop stale entries. Handlers run synchronously on the writer's thread and
+only see writes made by this process - other workers rely on cache TTLs.
+"""
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+EMPLOYEES_CHANGED = "employees.changed"
+ASSETS_CHANGED = "assets.changed"
+SKILLS_CHANGED = "skills.changed"
+ATTENDANCE_CHANGED = "attendance.changed"
+LEAVES_CHANGED = "leaves.changed"
+TRAINING_CHANGED = "training.changed"
+HOLIDAYS_CHANGED = "holidays.changed"
+USERS_CHANGED = "users.changed"
+
+_subscribers: Dict[str, List[Callable]] = defaultdict(list)
+_lock = threading.Lock()
+
+
+def subscribe(topic: str, handler: Callable):
+    with _lock:
+        _subscribers[topic].append(handler)
+
+
+def publish(topic: str, **payload):
+    with _lock:
+        handlers = list(_subscribers.get(topic, ()))
+    for handler in handlers:
+        try:
+            handler(**payload)
+        except Exception as e:
+            # A failing cache hook must never fail the write that triggered it.
+            print(f"Event handler for {topic} failed: {e}")
@@ -0,0 +1,155 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+# PBKDF2 work factor for new hashes. Existing hashes with a different round
+# count still verify, and are re-hashed with this value on the next login.
+PASSWORD_HASH_ROUNDS = int(os.environ.get("PASSWORD_HASH_ROUNDS", "29000"))
+# Worker processes for hashing; 0 hashes in the calling thread (dev/tests).
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Verifications allowed in flight (running + queued) before logins get a 429.
+PASSWORD_HASH_QUEUE_DEPTH = int(os.environ.get("PASSWORD_HASH_QUEUE_DEPTH", str(max(1, PASSWORD_HASH_WORKERS) * 8)))
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing queue is full; callers should answer 429."""
+
+
+@lru_cache(maxsize=4)
+def _context(rounds: int) -> CryptContext:
+    # Pinning min/max to the configured value makes verify_and_update flag
+    # hashes made with any other round count.
+    return CryptContext(
+        schemes=["pbkdf2_sha256"],
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=rounds,
+        pbkdf2_sha256__max_rounds=rounds,
+    )
+
+
+def _verify_and_update(password: str, password_hash: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    try:
+        return _context(rounds).verify_and_update(password, password_hash)
+    except (ValueError, TypeError):
+        # Malformed or unrecognised stored hash.
+        return False, None
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+class PasswordHasher:
+    """PBKDF2 hashing on a small process pool so logins never tie up request threads.
+
+    At most `queue_depth` jobs are accepted at once; beyond that `HasherBusy`
+    is raised immediately instead of letting work pile up.
+    """
+
+    def __init__(self, rounds: int = PASSWORD_HASH_ROUNDS, workers: int = PASSWORD_HASH_WORKERS,
+                 queue_depth: int = PASSWORD_HASH_QUEUE_DEPTH):
+        self.rounds = rounds
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(queue_depth)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # spawn: forking a process that runs server threads is unsafe.
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        # A worker died (OOM kill etc.); drop the broken pool so the next
+        # login starts a fresh one instead of failing forever.
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _on_done(self, future: Future, pool: Optional[ProcessPoolExecutor]):
+        self._slots.release()
+        if pool is not None and isinstance(future.exception(), BrokenProcessPool):
+            self._discard_pool(pool)
+
+    def _submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy("Too many login attempts in progress, please retry shortly")
+        pool = None
+        try:
+            if self.workers > 0:
+                pool = self._executor()
+                try:
+                    future = pool.submit(fn, *args)
+                except BrokenProcessPool:
+                    self._discard_pool(pool)
+                    pool = self._executor()
+                    future = pool.submit(fn, *args)
+            else:
+                future = Future()
+                try:
+                    future.set_result(fn(*args))
+                except Exception as e:
+                    future.set_exception(e)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._on_done(f, pool))
+        return future
+
+    def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """(valid, new_hash); new_hash is set when the stored hash should be replaced."""
+        return self._submit(_verify_and_update, password, password_hash, self.rounds).result()
+
+    async def verify_and_update_async(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        if self.workers <= 0:
+            # Inline mode must not hash on the event loop.
+            return await run_in_threadpool(self.verify_and_update, password, password_hash)
+        return await asyncio.wrap_future(self._submit(_verify_and_update, password, password_hash, self.rounds))
+
+    def hash(self, password: str) -> str:
+        # Account creation is rare; hash inline rather than competing with logins for slots.
+        return _hash(password, self.rounds)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """Inline check for non-login callers (e.g. confirming the current password).
+
+        Only logins are admission-controlled, so this never raises HasherBusy.
+        """
+        return _verify_and_update(password, password_hash, self.rounds)[0]
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = PasswordHasher()
+    return _hasher
+
+
+def shutdown_password_hasher():
+    if _hasher is not None:
+        _hasher.shutdown()
@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from backend.core.cache import TTLCache, register_cache
+from backend.core.events import subscribe, USERS_CHANGED
+from backend.repositories.user_repo import UserRepository
+
+# "sqlite" shares sessions across workers and restarts; "memory" keeps the
+# old single-process behaviour (handy for local dev and tests).
+SESSION_BACKEND = os.environ.get("SESSION_BACKEND", "sqlite")
+# How long a worker may serve a session from its local cache before
+# re-reading it. A logout on another worker is seen after at most this long.
+SESSION_CACHE_TTL = float(os.environ.get("SESSION_CACHE_TTL", "30"))
+SESSION_CACHE_SIZE = int(os.environ.get("SESSION_CACHE_SIZE", "10000"))
+SESSION_SWEEP_INTERVAL = float(os.environ.get("SESSION_SWEEP_INTERVAL", "600"))
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _user_matches(user: Dict[str, Any], username: Optional[str], employee_code: Optional[str]) -> bool:
+    return ((username is not None and user.get('username') == username) or
+            (employee_code is not None and user.get('employee_code') == employee_code))
+
+
+class SessionStore(ABC):
+    @abstractmethod
+    def create(self, token: str, user: Dict[str, Any], expires_at: datetime):
+        ...
+
+    @abstractmethod
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    def peek(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the user only if it can be answered without I/O."""
+        return None
+
+    def load(self, token: str) -> Optional[Dict[str, Any]]:
+        """Fetch from the backing store, bypassing any local cache."""
+        return self.get(token)
+
+    @abstractmethod
+    def delete(self, token: str):
+        ...
+
+    @abstractmethod
+    def forget_user(self, username: Optional[str] = None, employee_code: Optional[str] = None):
+        """Stop serving a deleted or deactivated user's sessions from memory."""
+
+    def sweep_expired(self) -> int:
+        return 0
+
+
+class InMemorySessionStore(SessionStore):
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, token, user, expires_at):
+        with self._lock:
+            self._sessions[token] = {"user": user, "expires_at": expires_at}
+
+    def get(self, token):
+        with self._lock:
+            session = self._sessions.get(token)
+            if not session:
+                return None
+            if datetime.now() > session['expires_at']:
+                del self._sessions[token]
+                return None
+            return session['user']
+
+    def peek(self, token):
+        return self.get(token)
+
+    def delete(self, token):
+        with self._lock:
+            self._sessions.pop(token, None)
+
+    def forget_user(self, username=None, employee_code=None):
+        # This store has no database check behind it, so the sessions go for good.
+        with self._lock:
+            doomed = [t for t, s in self._sessions.items() if _user_matches(s['user'], username, employee_code)]
+            for t in doomed:
+                del self._sessions[t]
+
+    def sweep_expired(self):
+        now = datetime.now()
+        with self._lock:
+            expired = [t for t, s in self._sessions.items() if now > s['expires_at']]
+            for t in expired:
+                del self._sessions[t]
+        return len(expired)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions persisted in the `sessions` table with a per-process LRU read-through cache."""
+
+    def __init__(self, cache_ttl: float = SESSION_CACHE_TTL, cache_size: int = SESSION_CACHE_SIZE,
+                 sweep_interval: float = SESSION_SWEEP_INTERVAL):
+        self.repo = UserRepository()
+        self.cache = register_cache("sessions", TTLCache(maxsize=cache_size, ttl=cache_ttl))
+        self.sweep_interval = sweep_interval
+        self._last_sweep = time.monotonic()
+
+    def _cache_put(self, token: str, user: Dict[str, Any], expires_at: datetime):
+        remaining = (expires_at - datetime.now()).total_seconds()
+        if remaining > 0:
+            self.cache.set(token, (user, expires_at), ttl=min(self.cache.ttl, remaining))
+
+    def create(self, token, user, expires_at):
+        self.repo.create_session(token, user['id'], expires_at.strftime(TIMESTAMP_FORMAT))
+        self._cache_put(token, user, expires_at)
+        self._maybe_sweep()
+
+    def peek(self, token):
+        cached = self.cache.get(token)
+        if cached is None:
+            return None
+        user, expires_at = cached
+        if datetime.now() > expires_at:
+            self.cache.delete(token)
+            return None
+        return user
+
+    def get(self, token):
+        user = self.peek(token)
+        if user is not None:
+            return user
+        return self.load(token)
+
+    def load(self, token):
+        row = self.repo.get_session_user(token, datetime.now().strftime(TIMESTAMP_FORMAT))
+        if not row:
+            return None
+
+        user = {
+            "id": row['id'],
+            "username": row['username'],
+            "role": row['role'],
+            "employee_code": row['employee_code']
+        }
+        self._cache_put(token, user, datetime.strptime(row['expires_at'], TIMESTAMP_FORMAT))
+        return user
+
+    def delete(self, token):
+        self.cache.delete(token)
+        self.repo.delete_session(token)
+
+    def forget_user(self, username=None, employee_code=None):
+        # The next request re-reads the session, which checks users.is_active.
+        self.cache.delete_matching(lambda token, entry: _user_matches(entry[0], username, employee_code))
+
+    def sweep_expired(self):
+        self._last_sweep = time.monotonic()
+        return self.repo.delete_expired_sessions(datetime.now().strftime(TIMESTAMP_FORMAT))
+
+    def _maybe_sweep(self):
+        # Piggy-backs on logins rather than a background thread.
+        if time.monotonic() - self._last_sweep >= self.sweep_interval:
+            try:
+                self.sweep_expired()
+            except Exception as e:
+                print(f"Session sweep failed: {e}")
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if SESSION_BACKEND == "memory":
+                    _store = InMemorySessionStore()
+                elif SESSION_BACKEND == "sqlite":
+                    _store = SQLiteSessionStore()
+                else:
+                    raise ValueError(f"Unknown session backend: {SESSION_BACKEND}")
+    return _store
+
+
+def _on_users_changed(username: Optional[str] = None, employee_code: Optional[str] = None, **_):
+    if _store is not None:
+        _store.forget_user(username=username, employee_code=employee_code)
+
+
+subscribe(USERS_CHANGED, _on_users_changed)
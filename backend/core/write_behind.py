@@ -0,0 +1,165 @@
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+class WriteBehindQueue:
+    """Collects items and hands them to `flush_fn` in batches from a background thread.
+
+    A batch is written once `max_batch` items are waiting or the oldest one has
+    waited `max_delay` seconds. `flush()` writes synchronously. `close()` keeps
+    retrying until the queue is empty, so nothing accepted is lost on a clean
+    shutdown, even while the database is locked.
+
+    When a batch fails, its items are retried one at a time so a single bad
+    item can't hold up the rest. An item that has failed `max_attempts` times
+    is dropped, logged and passed to `on_drop(item, error)`. Errors for which
+    `is_transient(error)` is true (e.g. a locked database) don't count as
+    attempts; the batch is simply retried on the next cycle.
+    """
+
+    def __init__(self, flush_fn: Callable[[List[Any]], Any], max_batch: int = 500,
+                 max_delay: float = 0.2, name: str = "write-behind", max_attempts: int = 3,
+                 on_drop: Optional[Callable[[Any, Exception], Any]] = None,
+                 is_transient: Callable[[Exception], bool] = lambda e: False, max_backoff: float = 5.0):
+        self.flush_fn = flush_fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.name = name
+        self.max_attempts = max_attempts
+        self.on_drop = on_drop
+        self.is_transient = is_transient
+        self.max_backoff = max_backoff
+        # Entries are [item, failed_attempts].
+        self._items: List[list] = []
+        self._oldest = 0.0
+        self._cond = threading.Condition()
+        # Serializes writers so a manual flush() and the thread never interleave batches.
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, item: Any):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"{self.name} queue is closed")
+            first = not self._items
+            if first:
+                self._oldest = time.monotonic()
+            self._items.append([item, 0])
+            # Wake the writer to start the max_delay timer, or for a full batch.
+            if first or len(self._items) >= self.max_batch:
+                self._cond.notify()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+    def _take(self) -> List[list]:
+        batch, self._items = self._items, []
+        return batch
+
+    def _requeue(self, entries: List[list]):
+        with self._cond:
+            if self._items:
+                self._items = entries + self._items
+            else:
+                self._items = entries
+                self._oldest = time.monotonic()
+
+    def _drop(self, entry: list, error: Exception):
+        print(f"{self.name}: dropping {entry[0]!r} after {entry[1]} failed attempts: {error}")
+        if self.on_drop is not None:
+            try:
+                self.on_drop(entry[0], error)
+            except Exception as e:
+                print(f"{self.name}: on_drop failed for {entry[0]!r}: {e}")
+
+    def _write(self, entries: List[list]) -> bool:
+        """Write `entries`; True when nothing had to be put back."""
+        try:
+            self.flush_fn([e[0] for e in entries])
+            return True
+        except Exception as e:
+            if self.is_transient(e):
+                print(f"{self.name}: writing {len(entries)} item(s) failed, will retry: {e}")
+                self._requeue(entries)
+                return False
+            if len(entries) > 1:
+                print(f"{self.name}: batch of {len(entries)} failed ({e}); retrying items one at a time")
+
+        retry = []
+        for entry in entries:
+            try:
+                self.flush_fn([entry[0]])
+            except Exception as e:
+                if not self.is_transient(e):
+                    entry[1] += 1
+                    if entry[1] >= self.max_attempts:
+                        self._drop(entry, e)
+                        continue
+                retry.append(entry)
+        if retry:
+            self._requeue(retry)
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if len(self._items) >= self.max_batch:
+                        break
+                    if self._items:
+                        remaining = self._oldest + self.max_delay - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+            with self._write_lock:
+                with self._cond:
+                    batch = self._take()
+                if batch and not self._write(batch):
+                    time.sleep(self.max_delay)
+
+    def flush(self):
+        """Write everything queued on the calling thread. Never raises.
+
+        Failing items get up to `max_attempts` tries here before being dropped;
+        items still hitting transient errors after that stay queued.
+        """
+        with self._write_lock:
+            for attempt in range(self.max_attempts):
+                with self._cond:
+                    batch = self._take()
+                if not batch or self._write(batch):
+                    return
+                time.sleep(self.max_delay * (attempt + 1) / self.max_attempts)
+            if len(self):
+                print(f"{self.name}: {len(self)} item(s) still queued after flush")
+
+    def close(self):
+        """Stop the writer thread and write everything still queued.
+
+        Unlike flush(), this doesn't give up on transient errors: it backs off
+        (up to `max_backoff` seconds between passes) and retries until the
+        queue is empty. Items failing for other reasons are still dropped after
+        `max_attempts`.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        delay = self.max_delay
+        with self._write_lock:
+            while True:
+                with self._cond:
+                    batch = self._take()
+                if not batch or self._write(batch):
+                    return
+                print(f"{self.name}: {len(self)} item(s) still queued at shutdown, retrying in {delay:g}s")
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
@@ -1,393 +1,309 @@
 import sqlite3
 import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 DB_PATH = os.path.join(DATA_DIR, 'employee.db')
 
+# Max connections open at once. Borrowers beyond that wait up to
+# DB_POOL_TIMEOUT seconds for one to be returned, then get PoolTimeout.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "8"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+
+# Connection-level tuning. "default" suits the API server; "bulk" trades some
+# durability for speed during imports and backfills.
+STORAGE_PROFILES = {
+    "default": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,      # ~64 MB page cache
+        "mmap_size": 268435456,    # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout_ms": 5000,
+    },
+    "bulk": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 1073741824,
+        "temp_store": "MEMORY",
+        "busy_timeout_ms": 30000,
+    },
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout_ms": 10000,
+    },
+}
+DB_STORAGE_PROFILE = os.environ.get("DB_STORAGE_PROFILE", "default")
+
+# Retries for writes that still hit SQLITE_BUSY after the busy timeout.
+DB_BUSY_RETRIES = int(os.environ.get("DB_BUSY_RETRIES", "3"))
+DB_BUSY_BACKOFF = float(os.environ.get("DB_BUSY_BACKOFF", "0.05"))
+
 # Ensure DATA_DIR exists
 os.makedirs(DATA_DIR, exist_ok=True)
 
 
 print(f"Database will be created at: {DB_PATH}")
 
-def get_db_connection():
 
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+class PoolTimeout(sqlite3.OperationalError):
+    """No pooled connection became free within DB_POOL_TIMEOUT."""
 
-def create_tables():
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    print("Creating tables...")
 
-    # 1) Employees Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS employees (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_code TEXT UNIQUE,
-            name TEXT NOT NULL,
-            dob TEXT,
-            contact_number TEXT,
-            emergency_contact TEXT,
-            email_id TEXT,
-            doj TEXT, 
-            team TEXT,
-            designation TEXT,
-            employment_type TEXT,
-            reporting_manager TEXT,
-            location TEXT,
-            current_address TEXT,
-            permanent_address TEXT,
-            education_details TEXT,
-            employment_status TEXT DEFAULT 'Active',
-            photo_path TEXT,
-            cv_path TEXT,
-            id_proofs TEXT,
-            pf_included TEXT,
-            mediclaim_included TEXT,
-            notes TEXT,
-            exit_date TEXT,
-            exit_reason TEXT,
-            clearance_status TEXT
-        )
-    ''')
-    
-    # 2) Users Table 
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            role TEXT CHECK(role IN ('HR', 'Admin', 'Management', 'Employee')) NOT NULL,
-            employee_code TEXT,
-            is_active INTEGER DEFAULT 1,
-            last_login TIMESTAMP,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # 2b) Onboarding Invites Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS onboarding_invites (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            token TEXT UNIQUE NOT NULL,
-            email TEXT NOT NULL,
-            name TEXT NOT NULL,
-            role TEXT NOT NULL DEFAULT 'Employee',
-            department TEXT,
-            designation TEXT,
-            status TEXT DEFAULT 'Pending',  -- Pending, Completed, Expired
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            expires_at TIMESTAMP
-        )
-    ''')
-
-    # 3) Skill Matrix Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS skill_matrix (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_code TEXT,
-            candidate_name TEXT,
-            primary_skillset TEXT,
-            secondary_skillset TEXT,
-            experience_years REAL,
-            last_contact_date TEXT,
-            cv_upload TEXT
-        )
-    ''')
-
-    # 4) Assets Checklist Table (New)
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS assets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_code TEXT UNIQUE,
-            
-            -- Onboarding
-            ob_laptop INTEGER DEFAULT 0,
-            ob_laptop_bag INTEGER DEFAULT 0,
-            ob_headphones INTEGER DEFAULT 0,
-            ob_mouse INTEGER DEFAULT 0,
-            ob_extra_hardware INTEGER DEFAULT 0,
-            ob_client_assets INTEGER DEFAULT 0,
-            
-            ob_id_card INTEGER DEFAULT 0, -- New
-            ob_email_access INTEGER DEFAULT 0, -- Moved from employees
-            ob_groups INTEGER DEFAULT 0, -- Moved from employees
-            ob_mediclaim INTEGER DEFAULT 0, -- Moved from employees
-            ob_pf INTEGER DEFAULT 0, -- Moved from employees
-            
-            ob_remarks TEXT,
-
-            -- Clearance
-            cl_laptop INTEGER DEFAULT 0,
-            cl_laptop_bag INTEGER DEFAULT 0,
-            cl_headphones INTEGER DEFAULT 0,
-            cl_mouse INTEGER DEFAULT 0,
-            cl_extra_hardware INTEGER DEFAULT 0,
-            cl_client_assets INTEGER DEFAULT 0,
-            
-            cl_id_card INTEGER DEFAULT 0, -- New
-            cl_email_access INTEGER DEFAULT 0, -- Revoke
-            cl_groups INTEGER DEFAULT 0, -- Remove
-            cl_relieving_letter INTEGER DEFAULT 0, -- Moved from employees
-
-            cl_remarks TEXT,
-
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (employee_code) REFERENCES employees(employee_code)
-        )
-    ''')
-
-    # 5) HR Activity Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS hr_activity (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_code TEXT,
-            employee_name TEXT,
-            training_assigned TEXT,
-            training_date TEXT,
-            training_duration TEXT,
-            training_status TEXT,
-            status TEXT,
-            last_follow_up TEXT,
-            program_id INTEGER
-        )
-    ''')
-    
-    # 5b) Training Library (Actual table used by code)
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS training_library (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            program_name TEXT NOT NULL,
-            description TEXT,
-            default_duration TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    # 6) Performance Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS performance (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_code TEXT,
-            employee_name TEXT,
-            monthly_check_in_notes TEXT,
-            manager_feedback TEXT,
-            improvement_areas TEXT,
-            recognition_rewards TEXT
-        )
-    ''')
-
-    # 7) KRA Library Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS kra_library (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            goal_name TEXT,
-            description TEXT,
-            weightage REAL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    # 8) KRA Assignments Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS kra_assignments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            kra_id INTEGER NOT NULL,
-            employee_code TEXT NOT NULL,
-            period TEXT,
-            status TEXT DEFAULT 'Assigned',
-            self_rating REAL,
-            manager_rating REAL,
-            final_score REAL,
-            self_comment TEXT,
-            manager_comment TEXT,
-            assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (kra_id) REFERENCES kra_library(id),
-            FOREIGN KEY (employee_code) REFERENCES employees(employee_code)
-        )
-    ''')
-
-    # 9) Employee Groups Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS employee_groups (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            group_name TEXT NOT NULL,
-            description TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    # 10) Employee Group Members Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS employee_group_members (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            group_id INTEGER NOT NULL,
-            employee_code TEXT NOT NULL,
-            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (group_id) REFERENCES employee_groups(id)
-        )
-    ''')
-
-    # 11) Training Programs Table (Legacy/Unused?)
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS training_programs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            program_name TEXT NOT NULL,
-            description TEXT,
-            default_duration TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    # 12) Training Assignments Table (Legacy/Unused?)
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS training_assignments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_code TEXT NOT NULL,
-            program_id INTEGER NOT NULL,
-            training_date TEXT,
-            duration TEXT,
-            status TEXT DEFAULT 'Pending',
-            assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (program_id) REFERENCES training_programs(id)
-        )
-    ''')
-
-    # 13) Audit Logs Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS audit_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT,
-            action TEXT NOT NULL,
-            details TEXT,
-            ip_address TEXT,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # 14) Notifications Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS notifications (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_code TEXT,
-            title TEXT,
-            message TEXT,
-            type TEXT,
-            is_read INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # 15) Employee Documents Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS employee_documents (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_code TEXT,
-            document_type TEXT,
-            document_name TEXT,
-            file_path TEXT,
-            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            uploaded_by TEXT
-        )
-    ''')
-
-    # 16) Attendance Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS attendance (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_code TEXT NOT NULL,
-            date TEXT NOT NULL,
-            clock_in TEXT,
-            clock_out TEXT,
-            work_log TEXT,
-            status TEXT DEFAULT 'Present',
-            ip_address TEXT,
-            FOREIGN KEY (employee_code) REFERENCES employees(employee_code),
-            UNIQUE(employee_code, date)
-        )
-    ''')
-
-    # 17) Leaves Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS leaves (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_code TEXT NOT NULL,
-            start_date TEXT NOT NULL,
-            end_date TEXT NOT NULL,
-            leave_type TEXT NOT NULL,
-            reason TEXT,
-            status TEXT DEFAULT 'Pending', -- Pending, Approved, Rejected
-            rejection_reason TEXT,
-            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (employee_code) REFERENCES employees(employee_code)
-        )
-    ''')
-    
-    # 18) Leave Balances Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS leave_balances (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_code TEXT NOT NULL UNIQUE,
-            year INTEGER NOT NULL,
-            sick_total INTEGER DEFAULT 10,
-            sick_used INTEGER DEFAULT 0,
-            casual_total INTEGER DEFAULT 12,
-            casual_used INTEGER DEFAULT 0,
-            privilege_total INTEGER DEFAULT 15,
-            privilege_used INTEGER DEFAULT 0,
-            FOREIGN KEY (employee_code) REFERENCES employees(employee_code)
-        )
-    ''')
-
-    # 19) Sessions Table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS sessions (
-            session_token TEXT PRIMARY KEY,
-            user_id INTEGER,
-            expires_at TIMESTAMP,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    # 20) Quarterly Assessments (Excel-like)
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS quarterly_assessments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_code TEXT,
-            year INTEGER,
-            quarter TEXT, -- Q1, Q2, Q3, Q4
-            status TEXT DEFAULT 'Draft', -- Draft, Submitted, Finalized
-            total_score INTEGER DEFAULT 0,
-            percentage REAL DEFAULT 0.0,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(employee_code, year, quarter)
-        )
-    ''') 
-
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS assessment_entries (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            assessment_id INTEGER,
-            category TEXT,
-            subcategory TEXT,
-            self_score INTEGER DEFAULT 0,
-            manager_score INTEGER DEFAULT 0,
-            score INTEGER DEFAULT 0, -- Final score used for calcs
-
-            manager_comment TEXT,
-            employee_comment TEXT,
-            FOREIGN KEY(assessment_id) REFERENCES quarterly_assessments(id)
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to the pool.
+
+    Repositories keep their `conn = get_db_connection() ... finally: conn.close()`
+    shape; close() only really closes once the owning pool is shut down.
+
+    A nested borrow on the same thread (a repository call made while another
+    one still holds the connection) runs inside a SAVEPOINT: its commit()
+    releases the savepoint, rollback() and close() without commit undo only
+    its own work, and the outer caller's transaction is left alone.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool = None
+        self._owner = None
+        self._savepoints = []
+
+    def _enter_nested(self):
+        name = f"nested_{len(self._savepoints) + 1}"
+        self.execute(f"SAVEPOINT {name}")
+        self._savepoints.append(name)
+
+    def _leave_nested(self):
+        name = self._savepoints.pop()
+        try:
+            self.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            self.execute(f"RELEASE SAVEPOINT {name}")
+        except sqlite3.Error:
+            # The savepoint went away with a failed outer transaction.
+            pass
+
+    def commit(self):
+        if not self._savepoints:
+            return super().commit()
+        # Keep later work in this borrow nested under a fresh savepoint.
+        name = self._savepoints[-1]
+        self.execute(f"RELEASE SAVEPOINT {name}")
+        self.execute(f"SAVEPOINT {name}")
+
+    def rollback(self):
+        if not self._savepoints:
+            return super().rollback()
+        self.execute(f"ROLLBACK TO SAVEPOINT {self._savepoints[-1]}")
+
+    def close(self):
+        if self._pool is None:
+            super().close()
+        elif self._savepoints:
+            self._leave_nested()
+        else:
+            self._pool.release(self)
+
+    def close_now(self):
+        super().close()
+
+
+def apply_storage_profile(conn: sqlite3.Connection, profile_name: str = DB_STORAGE_PROFILE):
+    if profile_name not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown storage profile: {profile_name}")
+    profile = STORAGE_PROFILES[profile_name]
+
+    conn.execute(f"PRAGMA busy_timeout = {int(profile['busy_timeout_ms'])}")
+    # journal_mode is persistent in the file; the rest are per-connection.
+    conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+    conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+    conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+    conn.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+
+
+def is_busy_error(exc: Exception) -> bool:
+    if not isinstance(exc, sqlite3.OperationalError):
+        return False
+    msg = str(exc).lower()
+    return "database is locked" in msg or "database is busy" in msg
+
+
+def retry_on_busy(func=None, *, retries: int = None, backoff: float = None):
+    """Retry a write when SQLite reports the database as locked/busy.
+
+    The wrapped call must be safe to repeat, i.e. it opens its own connection
+    and commits (or fails) as a unit - the shape every repository write has.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            max_retries = DB_BUSY_RETRIES if retries is None else retries
+            delay = DB_BUSY_BACKOFF if backoff is None else backoff
+            attempt = 0
+            while True:
+                try:
+                    return fn(*args, **kwargs)
+                except sqlite3.OperationalError as e:
+                    if not is_busy_error(e) or attempt >= max_retries:
+                        raise
+                    attempt += 1
+                    time.sleep(delay * (2 ** (attempt - 1)))
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+class ConnectionPool:
+    """At most `max_size` connections, one per borrowing thread at a time."""
+
+    def __init__(self, db_path: str, max_size: int = DB_POOL_SIZE, profile: str = DB_STORAGE_PROFILE,
+                 timeout: float = DB_POOL_TIMEOUT):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        if profile not in STORAGE_PROFILES:
+            raise ValueError(f"Unknown storage profile: {profile}")
+        self.profile = profile
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        # One slot per open connection, idle or borrowed.
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._local = threading.local()
+        self._closed = False
+
+    def _connect(self) -> PooledConnection:
+        profile = STORAGE_PROFILES[self.profile]
+        conn = sqlite3.connect(
+            self.db_path,
+            factory=PooledConnection,
+            check_same_thread=False,
+            timeout=profile['busy_timeout_ms'] / 1000,
         )
-    ''')
+        conn.row_factory = sqlite3.Row
+        apply_storage_profile(conn, self.profile)
+        conn._pool = self
+        return conn
+
+    def acquire(self, bind_thread: bool = True) -> PooledConnection:
+        """Borrow a connection.
+
+        A bound borrow is shared, as a nested SAVEPOINT, by later borrows on the
+        same thread. An unbound one (bind_thread=False) is private to its holder
+        and may be released from another thread.
+        """
+        conn = getattr(self._local, 'conn', None) if bind_thread else None
+        # Skips a stale reference to a connection released from another thread.
+        if conn is not None and conn._owner == threading.get_ident():
+            conn._enter_nested()
+            return conn
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"No database connection free after {self.timeout:g}s ({self.max_size} in use)")
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+        if bind_thread:
+            conn._owner = threading.get_ident()
+            self._local.conn = conn
+        return conn
+
+    def release(self, conn: PooledConnection):
+        if getattr(self._local, 'conn', None) is conn:
+            self._local.conn = None
+        conn._owner = None
+        try:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                conn.close_now()
+                return
+            if self._closed:
+                conn.close_now()
+                return
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close_now()
+        finally:
+            self._slots.release()
 
-    conn.commit()
-    conn.close()
+    def close_all(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close_now()
+            except queue.Empty:
+                break
+
+
+_pool = ConnectionPool(DB_PATH)
+
+
+def get_db_connection():
+    return _pool.acquire()
+
+
+@contextmanager
+def db_session():
+    """Run a block as one write transaction on a single borrowed connection.
+
+    Repository calls made inside it on the same thread reuse that connection;
+    their commits only release savepoints. The block commits when it finishes
+    and rolls back everything if it raises.
+    """
+    conn = _pool.acquire()
+    try:
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def get_db():
+    """FastAPI dependency yielding a pooled connection for the request.
+
+    Sync dependencies may be set up and torn down on different threadpool
+    threads, so this connection is not bound to the calling thread; pass it
+    to the repository explicitly.
+    """
+    conn = _pool.acquire(bind_thread=False)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def close_pool():
+    _pool.close_all()
+
+def create_tables():
+    """Create or upgrade the schema by applying any pending migrations."""
+    from backend.migrations import run_migrations
+
+    print("Creating tables...")
+    run_migrations()
     print("Tables created successfully!")
 
 if __name__ == "__main__":
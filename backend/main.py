@@ -15,7 +15,12 @@ from backend.api.v1 import (
     assessments, 
     training
 )
-from backend.database import DATA_DIR
+from backend.database import DATA_DIR, close_pool
+from backend.migrations import run_migrations
+from backend.services.attendance_service import close_punch_buffer
+from backend.core.password_hasher import shutdown_password_hasher
+from backend.core.session_store import get_session_store
+from backend.core.auth_context import AuthContextMiddleware
 
 app = FastAPI(title="EwandzDigital HRMS API")
 
@@ -27,6 +32,9 @@ origins = [
     "*"
 ]
 
+# Resolves the session cookie into request.state.user (inside CORS)
+app.add_middleware(AuthContextMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -53,6 +61,17 @@ app.include_router(assessments.router)
 # Ensure data dir
 os.makedirs(DATA_DIR, exist_ok=True)
 
+@app.on_event("startup")
+def startup():
+    run_migrations()
+    get_session_store().sweep_expired()
+
+@app.on_event("shutdown")
+def shutdown():
+    close_punch_buffer()
+    shutdown_password_hasher()
+    close_pool()
+
 @app.get("/")
 def read_root():
     return {"message": "EwandzDigital HRMS API is running (v1 Refactored)"}
@@ -0,0 +1,175 @@
+"""Versioned schema migrations.
+
+Each module in `backend/migrations/versions/` is named `NNNN_description.py`
+and defines:
+
+    DESCRIPTION = "..."
+    def upgrade(conn): ...
+
+and optionally `TRANSACTIONAL = False` for migrations that commit on their
+own (batched backfills). Transactional migrations run inside a single
+`BEGIN IMMEDIATE` together with their `schema_version` row. Non-transactional
+ones must be idempotent, since a crash part-way leaves them unrecorded and
+they are re-run on the next upgrade.
+"""
+import importlib
+import pkgutil
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from backend.database import get_db_connection
+from backend.migrations import versions
+
+VERSION_PATTERN = re.compile(r"^(\d{4})_(\w+)$")
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    description: str
+    upgrade: Callable
+    transactional: bool = True
+
+
+def discover_migrations() -> List[Migration]:
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        match = VERSION_PATTERN.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(Migration(
+            version=int(match.group(1)),
+            name=module_info.name,
+            description=getattr(module, "DESCRIPTION", match.group(2)),
+            upgrade=module.upgrade,
+            transactional=getattr(module, "TRANSACTIONAL", True),
+        ))
+
+    migrations.sort(key=lambda m: m.version)
+    seen = set()
+    for m in migrations:
+        if m.version in seen:
+            raise RuntimeError(f"Duplicate migration version {m.version:04d}")
+        seen.add(m.version)
+    return migrations
+
+
+def ensure_version_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.commit()
+
+
+def get_applied_versions(conn) -> set:
+    return {r[0] for r in conn.execute("SELECT version FROM schema_version").fetchall()}
+
+
+def get_current_version(conn) -> int:
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def _record(conn, migration: Migration):
+    conn.execute(
+        "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+        (migration.version, migration.name)
+    )
+
+
+def run_migrations(target: Optional[int] = None) -> List[int]:
+    """Apply pending migrations up to `target` (all when None). Returns applied versions."""
+    conn = get_db_connection()
+    applied_now = []
+    try:
+        ensure_version_table(conn)
+        for migration in discover_migrations():
+            if target is not None and migration.version > target:
+                break
+
+            # Take the write lock before re-checking so concurrent workers
+            # starting together don't apply the same step twice.
+            conn.execute("BEGIN IMMEDIATE")
+            if migration.version in get_applied_versions(conn):
+                conn.rollback()
+                continue
+
+            print(f"Applying migration {migration.name}: {migration.description}")
+            started = time.perf_counter()
+            try:
+                if migration.transactional:
+                    migration.upgrade(conn)
+                    _record(conn, migration)
+                    conn.commit()
+                else:
+                    conn.commit()
+                    migration.upgrade(conn)
+                    conn.execute("BEGIN IMMEDIATE")
+                    if migration.version not in get_applied_versions(conn):
+                        _record(conn, migration)
+                    conn.commit()
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+
+            print(f"  done in {time.perf_counter() - started:.2f}s")
+            applied_now.append(migration.version)
+        return applied_now
+    finally:
+        conn.close()
+
+
+def migration_status() -> List[dict]:
+    conn = get_db_connection()
+    try:
+        ensure_version_table(conn)
+        applied = {
+            r['version']: r['applied_at']
+            for r in conn.execute("SELECT version, applied_at FROM schema_version").fetchall()
+        }
+    finally:
+        conn.close()
+
+    return [
+        {
+            "version": m.version,
+            "name": m.name,
+            "description": m.description,
+            "applied_at": applied.get(m.version),
+        }
+        for m in discover_migrations()
+    ]
+
+
+# --- Helpers for online-safe data migrations ---
+
+def backfill_by_rowid(conn, table: str, statement: str, batch_size: int = DEFAULT_BATCH_SIZE, pause: float = 0.0) -> int:
+    """Run `statement` over consecutive rowid ranges of `table`, committing each range.
+
+    `statement` receives `:start` (exclusive) and `:end` (inclusive) rowid
+    bounds; typically an `INSERT ... SELECT ... WHERE rowid > :start AND
+    rowid <= :end` into a new table. Returns the number of rows written.
+    """
+    max_rowid = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+    total = 0
+    start = 0
+    while start < max_rowid:
+        end = start + batch_size
+        cur = conn.execute(statement, {"start": start, "end": end})
+        conn.commit()
+        total += max(cur.rowcount, 0)
+        start = end
+        if pause:
+            time.sleep(pause)
+    return total
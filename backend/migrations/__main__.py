@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+
+# Ensure backend package is in path (Project Root)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.migrations import run_migrations, migration_status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.migrations", description="Manage the HRMS database schema.")
+    sub = parser.add_subparsers(dest="command")
+
+    upgrade = sub.add_parser("upgrade", help="Apply pending migrations")
+    upgrade.add_argument("--target", type=int, default=None, help="Stop after this version")
+
+    sub.add_parser("status", help="List migrations and whether they are applied")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        for m in migration_status():
+            state = f"applied {m['applied_at']}" if m['applied_at'] else "pending"
+            print(f"{m['version']:04d}  {m['name']:<40} {state}")
+        return 0
+
+    # Default to upgrade
+    applied = run_migrations(getattr(args, "target", None))
+    if applied:
+        print(f"Applied {len(applied)} migration(s).")
+    else:
+        print("Schema is up to date.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
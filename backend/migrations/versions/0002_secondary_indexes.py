@@ -0,0 +1,26 @@
+DESCRIPTION = "Secondary indexes for repository lookups"
+
+# quarterly_assessments(employee_code, year) and leave_balances(employee_code)
+# are already served by their UNIQUE constraints, as is
+# attendance(employee_code, date).
+INDEXES = [
+    ("idx_employees_status_name", "employees(employment_status, name)"),
+    ("idx_users_employee_code", "users(employee_code)"),
+    ("idx_onboarding_invites_email_status", "onboarding_invites(email, status)"),
+    ("idx_skill_matrix_employee_code", "skill_matrix(employee_code)"),
+    ("idx_hr_activity_employee_code", "hr_activity(employee_code)"),
+    ("idx_performance_employee_code", "performance(employee_code)"),
+    ("idx_kra_assignments_employee_status", "kra_assignments(employee_code, status)"),
+    ("idx_notifications_employee_created", "notifications(employee_code, created_at)"),
+    ("idx_attendance_date", "attendance(date)"),
+    ("idx_leaves_employee_applied", "leaves(employee_code, applied_at)"),
+    ("idx_leaves_status_applied", "leaves(status, applied_at)"),
+    ("idx_assessment_entries_assessment_id", "assessment_entries(assessment_id)"),
+    ("idx_audit_logs_timestamp", "audit_logs(timestamp)"),
+]
+
+
+def upgrade(conn):
+    for name, target in INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    conn.execute("ANALYZE")
@@ -0,0 +1,5 @@
+DESCRIPTION = "Index sessions by expiry for TTL sweeps"
+
+
+def upgrade(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at)")
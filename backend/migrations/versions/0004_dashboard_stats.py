@@ -0,0 +1,121 @@
+DESCRIPTION = "Materialized admin dashboard counters maintained by triggers"
+
+# Each dimension maps a row ({r} = NEW/OLD) to the bucket it counts towards;
+# NULL means the row doesn't count for that dimension.
+EMPLOYEE_DIMENSIONS = {
+    "employees": "'total'",
+    "status": "{r}.employment_status",
+    "team": "{r}.team",
+    "designation": "{r}.designation",
+    "location": "{r}.location",
+    "hire_year": "CASE WHEN CAST(strftime('%Y', {r}.doj) AS INTEGER) > 1900 THEN strftime('%Y', {r}.doj) END",
+    # Per-date histogram of active joiners; tenure is derived from it at read time.
+    "active_doj": "CASE WHEN {r}.employment_status = 'Active' THEN date({r}.doj) END",
+}
+
+ASSET_DIMENSIONS = {
+    "asset_status": "CASE WHEN {r}.cl_laptop = 1 THEN 'Returned' WHEN {r}.ob_laptop = 1 THEN 'Assigned' END",
+}
+
+SKILL_DIMENSIONS = {
+    "experience": """CASE
+        WHEN {r}.experience_years > 0 AND {r}.experience_years <= 2 THEN '0-2'
+        WHEN {r}.experience_years > 2 AND {r}.experience_years <= 5 THEN '3-5'
+        WHEN {r}.experience_years > 5 AND {r}.experience_years <= 10 THEN '6-10'
+        WHEN {r}.experience_years > 10 AND {r}.experience_years <= 15 THEN '11-15'
+        WHEN {r}.experience_years > 15 AND {r}.experience_years <= 100 THEN '16+'
+    END""",
+}
+
+# primary_skillset is a comma separated string; split it with json_each
+# (CTEs aren't allowed inside triggers). Strings that can't be turned into a
+# JSON array (control characters) are skipped rather than failing the write.
+SKILL_ARRAY = """('["' || replace(replace(replace({r}.primary_skillset, '\\', '\\\\'), '"', '\\"'), ',', '","') || '"]')"""
+
+TRACKED_COLUMNS = {
+    "employees": "employment_status, team, designation, location, doj",
+    "assets": "ob_laptop, cl_laptop",
+    "skill_matrix": "experience_years, primary_skillset",
+}
+
+
+def _bump(dimension: str, expr: str, row: str, delta: int) -> str:
+    bucket = expr.format(r=row)
+    return f"""
+        INSERT INTO dashboard_stats (dimension, bucket, value)
+        SELECT '{dimension}', {bucket}, {delta} WHERE {bucket} IS NOT NULL
+        ON CONFLICT(dimension, bucket) DO UPDATE SET value = value + excluded.value;"""
+
+
+def _bump_skills(row: str, delta: int) -> str:
+    arr = SKILL_ARRAY.format(r=row)
+    return f"""
+        INSERT INTO dashboard_stats (dimension, bucket, value)
+        SELECT 'skill', trim(value), {delta} FROM json_each(CASE WHEN json_valid({arr}) THEN {arr} ELSE '[]' END)
+        WHERE {row}.primary_skillset IS NOT NULL AND trim(value) <> ''
+        ON CONFLICT(dimension, bucket) DO UPDATE SET value = value + excluded.value;"""
+
+
+def _body(table: str, dimensions: dict, row: str, delta: int) -> str:
+    stmts = [_bump(dim, expr, row, delta) for dim, expr in dimensions.items()]
+    if table == "skill_matrix":
+        stmts.append(_bump_skills(row, delta))
+    return "".join(stmts)
+
+
+def _create_triggers(conn, table: str, dimensions: dict):
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_insert AFTER INSERT ON {table}
+        BEGIN{_body(table, dimensions, 'NEW', 1)}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_delete AFTER DELETE ON {table}
+        BEGIN{_body(table, dimensions, 'OLD', -1)}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_update AFTER UPDATE OF {TRACKED_COLUMNS[table]} ON {table}
+        BEGIN{_body(table, dimensions, 'OLD', -1)}{_body(table, dimensions, 'NEW', 1)}
+        END
+    """)
+
+
+def _rebuild(conn, table: str, dimensions: dict):
+    for dimension, expr in dimensions.items():
+        bucket = expr.format(r=table)
+        conn.execute(f"""
+            INSERT INTO dashboard_stats (dimension, bucket, value)
+            SELECT '{dimension}', {bucket} AS b, COUNT(*) FROM {table}
+            WHERE b IS NOT NULL GROUP BY b
+        """)
+    if table == "skill_matrix":
+        arr = SKILL_ARRAY.format(r="s")
+        conn.execute(f"""
+            INSERT INTO dashboard_stats (dimension, bucket, value)
+            SELECT 'skill', trim(j.value) AS b, COUNT(*)
+            FROM skill_matrix s, json_each(CASE WHEN json_valid({arr}) THEN {arr} ELSE '[]' END) j
+            WHERE s.primary_skillset IS NOT NULL AND trim(j.value) <> ''
+            GROUP BY b
+        """)
+
+
+def upgrade(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS dashboard_stats (
+            dimension TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            value INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, bucket)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employees_doj ON employees(doj)")
+
+    # Runs inside the migration transaction, so no write can slip in between
+    # the backfill and the triggers taking over.
+    conn.execute("DELETE FROM dashboard_stats")
+    for table, dimensions in (("employees", EMPLOYEE_DIMENSIONS),
+                              ("assets", ASSET_DIMENSIONS),
+                              ("skill_matrix", SKILL_DIMENSIONS)):
+        _rebuild(conn, table, dimensions)
+        _create_triggers(conn, table, dimensions)
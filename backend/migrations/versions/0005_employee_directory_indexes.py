@@ -0,0 +1,21 @@
+DESCRIPTION = "Indexes for keyset-paginated, filtered employee directory"
+
+# Every directory sort ends with employee_code as a tie-breaker, so each index
+# carries it to let SQLite walk the index in order without a temp b-tree.
+INDEXES = [
+    ("idx_employees_name_code", "employees(name, employee_code)"),
+    ("idx_employees_doj_code", "employees(ifnull(doj, ''), employee_code)"),
+    ("idx_employees_team_name", "employees(team, name, employee_code)"),
+    ("idx_employees_designation_name", "employees(designation, name, employee_code)"),
+    ("idx_employees_manager_name", "employees(reporting_manager, name, employee_code)"),
+    ("idx_employees_location_name", "employees(location, name, employee_code)"),
+    ("idx_employees_status_name_code", "employees(employment_status, name, employee_code)"),
+]
+
+
+def upgrade(conn):
+    for name, target in INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    # Superseded by idx_employees_status_name_code.
+    conn.execute("DROP INDEX IF EXISTS idx_employees_status_name")
+    conn.execute("ANALYZE employees")
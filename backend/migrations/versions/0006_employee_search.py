@@ -0,0 +1,70 @@
+DESCRIPTION = "FTS5 employee search index kept in sync by triggers"
+
+# rowid mirrors employees.id so trigger updates are rowid lookups rather than
+# full-text queries on employee_code.
+REFRESH = """
+        INSERT INTO employee_search (rowid, employee_code, name, designation, team, location,
+                                     primary_skillset, secondary_skillset)
+        SELECT e.id, e.employee_code, e.name, e.designation, e.team, e.location,
+               (SELECT primary_skillset FROM skill_matrix WHERE employee_code = e.employee_code LIMIT 1),
+               (SELECT secondary_skillset FROM skill_matrix WHERE employee_code = e.employee_code LIMIT 1)
+        FROM employees e
+        {where};"""
+
+DROP_FOR_CODE = """
+        DELETE FROM employee_search
+        WHERE rowid = (SELECT id FROM employees WHERE employee_code = {r}.employee_code);"""
+
+
+def upgrade(conn):
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS employee_search USING fts5(
+            employee_code,
+            name,
+            designation,
+            team,
+            location,
+            primary_skillset,
+            secondary_skillset,
+            tokenize = "unicode61 remove_diacritics 2",
+            prefix = '2 3'
+        )
+    ''')
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_employees_search_insert AFTER INSERT ON employees
+        BEGIN{REFRESH.format(where="WHERE e.id = NEW.id")}
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_employees_search_delete AFTER DELETE ON employees
+        BEGIN
+            DELETE FROM employee_search WHERE rowid = OLD.id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_employees_search_update
+        AFTER UPDATE OF employee_code, name, designation, team, location ON employees
+        BEGIN
+            DELETE FROM employee_search WHERE rowid = OLD.id;{REFRESH.format(where="WHERE e.id = NEW.id")}
+        END
+    """)
+
+    skill_events = (
+        ("insert", "INSERT", ("NEW",)),
+        ("delete", "DELETE", ("OLD",)),
+        ("update", "UPDATE OF employee_code, primary_skillset, secondary_skillset", ("OLD", "NEW")),
+    )
+    for name, event, rows in skill_events:
+        body = "".join(
+            DROP_FOR_CODE.format(r=r) + REFRESH.format(where=f"WHERE e.employee_code = {r}.employee_code")
+            for r in rows
+        )
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_skill_matrix_search_{name} AFTER {event} ON skill_matrix
+            BEGIN{body}
+            END
+        """)
+
+    conn.execute("DELETE FROM employee_search")
+    conn.execute(REFRESH.format(where=""))
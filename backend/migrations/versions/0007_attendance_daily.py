@@ -0,0 +1,57 @@
+from backend.migrations import backfill_by_rowid
+
+DESCRIPTION = "attendance_daily rollup: one final status per employee per day"
+
+# Rows hold final statuses only: Present (clock-in trigger), Leave (written by
+# leave approval) and Absent/Weekend (close-of-day job). Days without a row
+# are still open and are resolved from the calendar at read time.
+#
+# Runs at API startup, so the history is backfilled in committed rowid ranges
+# (attendance first, then leaves) rather than holding the write lock for the
+# whole table. The trigger is created first so punches made meanwhile are
+# covered; every step is idempotent, so a re-run after a crash is safe.
+
+TRANSACTIONAL = False
+
+
+def upgrade(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS attendance_daily (
+            employee_code TEXT NOT NULL,
+            date TEXT NOT NULL,
+            status TEXT NOT NULL,
+            PRIMARY KEY (employee_code, date)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_attendance_daily_date ON attendance_daily(date)")
+
+    # A clock-in is final for the day and overrides any Leave/Absent already recorded.
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_attendance_daily_present AFTER INSERT ON attendance
+        BEGIN
+            INSERT INTO attendance_daily (employee_code, date, status)
+            VALUES (NEW.employee_code, NEW.date, 'Present')
+            ON CONFLICT(employee_code, date) DO UPDATE SET status = 'Present';
+        END
+    ''')
+
+    conn.commit()
+
+    backfill_by_rowid(conn, "attendance", '''
+        INSERT INTO attendance_daily (employee_code, date, status)
+        SELECT DISTINCT employee_code, date, 'Present' FROM attendance
+        WHERE rowid > :start AND rowid <= :end AND employee_code IS NOT NULL AND date IS NOT NULL
+        ON CONFLICT(employee_code, date) DO UPDATE SET status = 'Present'
+    ''')
+    backfill_by_rowid(conn, "leaves", '''
+        WITH RECURSIVE leave_days(employee_code, day, end_date) AS (
+            SELECT employee_code, date(start_date), date(end_date) FROM leaves
+            WHERE rowid > :start AND rowid <= :end
+              AND status = 'Approved' AND date(start_date) IS NOT NULL AND date(end_date) IS NOT NULL
+            UNION ALL
+            SELECT employee_code, date(day, '+1 day'), end_date FROM leave_days WHERE day < end_date
+        )
+        INSERT INTO attendance_daily (employee_code, date, status)
+        SELECT DISTINCT employee_code, day, 'Leave' FROM leave_days WHERE true
+        ON CONFLICT(employee_code, date) DO NOTHING
+    ''')
@@ -0,0 +1,9 @@
+DESCRIPTION = "Index approved-leave interval overlap queries"
+
+# end_date leads so `end_date >= range_start` seeks past historical leaves;
+# start_date rides along to filter the other bound from the index.
+
+
+def upgrade(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_leaves_status_end_start ON leaves(status, end_date, start_date)")
+    conn.execute("ANALYZE leaves")
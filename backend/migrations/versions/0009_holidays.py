@@ -0,0 +1,15 @@
+DESCRIPTION = "Holiday calendar, company-wide or per location"
+
+# location '' is a company-wide holiday; any other value only applies to
+# employees whose employees.location matches it (trimmed).
+
+
+def upgrade(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS holidays (
+            location TEXT NOT NULL DEFAULT '',
+            date TEXT NOT NULL,
+            name TEXT NOT NULL,
+            PRIMARY KEY (location, date)
+        ) WITHOUT ROWID
+    ''')
@@ -0,0 +1,33 @@
+DESCRIPTION = "Key leave_balances by (employee_code, year) and track carried-forward days"
+
+# employee_code alone was UNIQUE, so an employee could never get a second
+# year's row. SQLite can't drop a constraint in place; rebuild the table.
+# privilege_total already includes privilege_carried.
+
+
+def upgrade(conn):
+    conn.execute('''
+        CREATE TABLE leave_balances_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_code TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            sick_total INTEGER DEFAULT 10,
+            sick_used INTEGER DEFAULT 0,
+            casual_total INTEGER DEFAULT 12,
+            casual_used INTEGER DEFAULT 0,
+            privilege_total INTEGER DEFAULT 15,
+            privilege_used INTEGER DEFAULT 0,
+            privilege_carried INTEGER NOT NULL DEFAULT 0,
+            UNIQUE (employee_code, year),
+            FOREIGN KEY (employee_code) REFERENCES employees(employee_code)
+        )
+    ''')
+    conn.execute('''
+        INSERT INTO leave_balances_new (id, employee_code, year, sick_total, sick_used, casual_total,
+                                        casual_used, privilege_total, privilege_used)
+        SELECT id, employee_code, year, sick_total, sick_used, casual_total,
+               casual_used, privilege_total, privilege_used
+        FROM leave_balances
+    ''')
+    conn.execute("DROP TABLE leave_balances")
+    conn.execute("ALTER TABLE leave_balances_new RENAME TO leave_balances")
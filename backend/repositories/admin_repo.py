@@ -1,5 +1,6 @@
+import sqlite3
 from typing import List, Dict, Any, Optional
-from backend.database import get_db_connection
+from backend.database import get_db_connection, retry_on_busy
 
 class AdminRepository:
     def get_all_users(self) -> List[Dict[str, Any]]:
@@ -18,6 +19,7 @@ class AdminRepository:
         finally:
             conn.close()
 
+    @retry_on_busy
     def log_action(self, username: str, action: str, details: str, ip: str = None):
         conn = get_db_connection()
         try:
@@ -27,10 +29,14 @@ class AdminRepository:
         finally:
             conn.close()
 
-    def get_logs(self, limit: int = 100) -> List[Dict[str, Any]]:
-        conn = get_db_connection()
+    def get_logs(self, limit: int = 100, conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
+        """Latest audit entries; runs on `conn` (e.g. the request's get_db connection) when given."""
+        own = conn is None
+        if own:
+            conn = get_db_connection()
         try:
-            rows = conn.execute(f"SELECT * FROM audit_logs ORDER BY timestamp DESC LIMIT {limit}").fetchall()
+            rows = conn.execute("SELECT * FROM audit_logs ORDER BY timestamp DESC LIMIT ?", (limit,)).fetchall()
             return [dict(r) for r in rows]
         finally:
-            conn.close()
+            if own:
+                conn.close()
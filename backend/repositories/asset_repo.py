@@ -1,5 +1,6 @@
 from typing import Dict, Any, Optional
 from backend.database import get_db_connection
+from backend.core.events import publish, ASSETS_CHANGED
 
 class AssetRepository:
     def get_asset_checklist(self, employee_code: str) -> Optional[Dict[str, Any]]:
@@ -66,6 +67,7 @@ class AssetRepository:
                 employee_code
             ))
             conn.commit()
+            publish(ASSETS_CHANGED, employee_code=employee_code)
         finally:
             conn.close()
 
@@ -106,5 +108,6 @@ class AssetRepository:
                 data.get('cl_remarks', '')
             ))
             conn.commit()
+            publish(ASSETS_CHANGED, employee_code=employee_code)
         finally:
             conn.close()
@@ -1,6 +1,56 @@
 import sqlite3
-from typing import List, Optional, Dict, Any
-from backend.database import get_db_connection
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Dict, Any, Tuple
+from backend.database import get_db_connection, retry_on_busy
+from backend.core.events import publish, ATTENDANCE_CHANGED, LEAVES_CHANGED
+
+# Approved leaves overlapping [start, end], including ones that span the whole
+# range. Served by idx_leaves_status_end_start: the seek on end_date >= start
+# skips every leave that finished before the range.
+APPROVED_LEAVES_OVERLAP_SQL = """
+    SELECT employee_code, start_date, end_date, leave_type
+    FROM leaves
+    WHERE status = 'Approved' AND end_date >= :start AND start_date <= :end
+"""
+
+LEAVE_BALANCE_COLUMNS = {'Sick': 'sick_used', 'Casual': 'casual_used', 'Privilege': 'privilege_used'}
+# Yearly entitlement; matches the leave_balances column defaults, which a
+# balance row gets when it's first written mid-year.
+LEAVE_ENTITLEMENTS = {'sick_total': 10, 'casual_total': 12, 'privilege_total': 15}
+
+def _leave_dates(start: str, end: str) -> List[str]:
+    try:
+        d1 = datetime.strptime(start, '%Y-%m-%d').date()
+        d2 = datetime.strptime(end, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return []
+    return [(d1 + timedelta(days=i)).isoformat() for i in range((d2 - d1).days + 1)]
+
+def _leave_year(start: str, default: int) -> int:
+    try:
+        return datetime.strptime(start, '%Y-%m-%d').year
+    except (TypeError, ValueError):
+        return default
+
+def _sync_leave_rollup(conn: sqlite3.Connection, leave: Dict[str, Any]):
+    """Mirror a leave's approval state into attendance_daily (same transaction)."""
+    if leave['status'] == 'Approved':
+        conn.executemany('''
+            INSERT INTO attendance_daily (employee_code, date, status) VALUES (?, ?, 'Leave')
+            ON CONFLICT(employee_code, date) DO UPDATE SET status = 'Leave' WHERE status <> 'Present'
+        ''', [(leave['employee_code'], d) for d in _leave_dates(leave['start_date'], leave['end_date'])])
+    else:
+        # Un-approving frees the days unless another approved leave still covers them.
+        conn.execute('''
+            DELETE FROM attendance_daily
+            WHERE employee_code = ? AND date BETWEEN ? AND ? AND status = 'Leave'
+            AND NOT EXISTS (
+                SELECT 1 FROM leaves l
+                WHERE l.employee_code = attendance_daily.employee_code AND l.status = 'Approved'
+                AND l.start_date <= attendance_daily.date AND l.end_date >= attendance_daily.date
+            )
+        ''', (leave['employee_code'], leave['start_date'], leave['end_date']))
 
 class AttendanceRepository:
     def get_todays_attendance(self, employee_code: str, date: str) -> Optional[Dict[str, Any]]:
@@ -14,26 +64,57 @@ class AttendanceRepository:
         finally:
             conn.close()
 
-    def clock_in(self, employee_code: str, date: str, time: str, ip: str):
+    @retry_on_busy
+    def clock_in(self, employee_code: str, date: str, time: str, ip: str) -> bool:
+        """Insert today's punch; False if the employee already clocked in."""
         conn = get_db_connection()
         try:
-            conn.execute('''
+            cur = conn.execute('''
                 INSERT INTO attendance (employee_code, date, clock_in, ip_address, status)
                 VALUES (?, ?, ?, ?, 'Present')
+                ON CONFLICT(employee_code, date) DO NOTHING
             ''', (employee_code, date, time, ip))
             conn.commit()
+            if cur.rowcount == 0:
+                return False
+            publish(ATTENDANCE_CHANGED, employee_code=employee_code, date=date)
+            return True
         finally:
             conn.close()
 
-    def clock_out(self, employee_code: str, date: str, time: str, work_log: str):
+    @retry_on_busy
+    def clock_in_many(self, punches: List[tuple]) -> int:
+        """Insert (employee_code, date, time, ip) punches in one transaction; duplicates are skipped."""
         conn = get_db_connection()
         try:
-            conn.execute('''
+            cur = conn.executemany('''
+                INSERT INTO attendance (employee_code, date, clock_in, ip_address, status)
+                VALUES (?, ?, ?, ?, 'Present')
+                ON CONFLICT(employee_code, date) DO NOTHING
+            ''', punches)
+            conn.commit()
+            for employee_code, date, _, _ in punches:
+                publish(ATTENDANCE_CHANGED, employee_code=employee_code, date=date)
+            return cur.rowcount
+        finally:
+            conn.close()
+
+    @retry_on_busy
+    def clock_out(self, employee_code: str, date: str, time: str, work_log: str) -> Optional[Dict[str, Any]]:
+        """Close today's open punch; None if there is no open one."""
+        conn = get_db_connection()
+        try:
+            rows = conn.execute('''
                 UPDATE attendance 
                 SET clock_out = ?, work_log = ?
-                WHERE employee_code = ? AND date = ?
-            ''', (time, work_log, employee_code, date))
+                WHERE employee_code = ? AND date = ? AND clock_out IS NULL
+                RETURNING *
+            ''', (time, work_log, employee_code, date)).fetchall()
             conn.commit()
+            if not rows:
+                return None
+            publish(ATTENDANCE_CHANGED, employee_code=employee_code, date=date)
+            return dict(rows[0])
         finally:
             conn.close()
 
@@ -60,25 +141,42 @@ class AttendanceRepository:
         finally:
             conn.close()
 
-    def create_leave_balance(self, employee_code: str, year: int):
-        conn = get_db_connection()
-        try:
-            conn.execute(
-                "INSERT INTO leave_balances (employee_code, year) VALUES (?, ?)",
-                (employee_code, year)
-            )
-            conn.commit()
-        finally:
-            conn.close()
-    
-    def update_leave_balance(self, employee_code: str, column: str, days: int):
+    @retry_on_busy
+    def open_leave_year(self, year: int, carry_max: int) -> int:
+        """Open `year` for every active employee in one statement.
+
+        Sick and casual leave start afresh; up to `carry_max` unused privilege
+        days from the previous year carry forward on top of the entitlement.
+        Re-running recomputes the carry for rows that already exist (e.g. a
+        late approval for last December), keeping their used counts.
+        """
         conn = get_db_connection()
         try:
-            conn.execute(f"UPDATE leave_balances SET {column} = {column} + ? WHERE employee_code = ?", (days, employee_code))
+            cur = conn.execute("""
+                INSERT INTO leave_balances (employee_code, year, sick_total, casual_total,
+                                            privilege_total, privilege_carried)
+                SELECT e.employee_code, :year, :sick_total, :casual_total,
+                       :privilege_total + c.carried, c.carried
+                FROM employees e
+                JOIN (
+                    SELECT e2.employee_code,
+                           coalesce(max(0, min(:carry_max, p.privilege_total - p.privilege_used)), 0) AS carried
+                    FROM employees e2
+                    LEFT JOIN leave_balances p ON p.employee_code = e2.employee_code AND p.year = :year - 1
+                ) c ON c.employee_code = e.employee_code
+                WHERE e.employment_status = 'Active' AND e.employee_code IS NOT NULL
+                ON CONFLICT(employee_code, year) DO UPDATE SET
+                    privilege_total = privilege_total - privilege_carried + excluded.privilege_carried,
+                    privilege_carried = excluded.privilege_carried
+            """, {"year": year, "carry_max": carry_max, **LEAVE_ENTITLEMENTS})
             conn.commit()
+            publish(LEAVES_CHANGED)
+            return cur.rowcount
         finally:
             conn.close()
 
+
+    @retry_on_busy
     def create_leave_request(self, employee_code: str, start: str, end: str, l_type: str, reason: str):
         conn = get_db_connection()
         try:
@@ -87,6 +185,7 @@ class AttendanceRepository:
                 VALUES (?, ?, ?, ?, ?, 'Pending')
             ''', (employee_code, start, end, l_type, reason))
             conn.commit()
+            publish(LEAVES_CHANGED, employee_code=employee_code)
         finally:
             conn.close()
 
@@ -123,11 +222,86 @@ class AttendanceRepository:
         finally:
             conn.close()
 
-    def update_leave_status(self, leave_id: int, status: str, reason: Optional[str]):
+    @retry_on_busy
+    def decide_leaves(self, leave_ids: List[int], status: str, reason: Optional[str],
+                      check: Callable[[Dict[str, Any]], Optional[str]],
+                      count_days: Callable[[Dict[str, Any]], int]) -> Tuple[List[Dict[str, Any]], Dict[int, str]]:
+        """Approve/reject many leaves in one transaction.
+
+        `check` sees each leave (with the applicant's role and location) and
+        returns an error message to skip it; `count_days` gives the days an
+        approved leave costs. Approving a pending leave charges those days and
+        rejecting an approved one refunds them; balances get one UPDATE per
+        employee and leave type. Returns (decided rows, errors by id).
+        """
         conn = get_db_connection()
         try:
-            conn.execute("UPDATE leaves SET status = ?, rejection_reason = ? WHERE id = ?", (status, reason, leave_id))
+            conn.execute("BEGIN IMMEDIATE")
+            marks = ", ".join("?" * len(leave_ids))
+            found = {r['id']: dict(r) for r in conn.execute(f"""
+                SELECT l.id, l.employee_code, l.leave_type, l.start_date, l.end_date, l.status,
+                       (SELECT role FROM users u WHERE u.employee_code = l.employee_code) AS applicant_role,
+                       (SELECT location FROM employees e WHERE e.employee_code = l.employee_code) AS location
+                FROM leaves l
+                WHERE l.id IN ({marks})
+            """, leave_ids).fetchall()}
+
+            errors = {}
+            for leave_id in leave_ids:
+                leave = found.get(leave_id)
+                error = check(leave) if leave else "Leave request not found"
+                if error:
+                    errors[leave_id] = error
+            accepted = [i for i in leave_ids if i not in errors]
+            if not accepted:
+                return [], errors
+
+            marks = ", ".join("?" * len(accepted))
+            decided = conn.execute(f"""
+                UPDATE leaves SET status = ?, rejection_reason = ?
+                WHERE id IN ({marks})
+                RETURNING id, employee_code, leave_type, start_date, end_date, status
+            """, [status, reason, *accepted]).fetchall()
+            for r in decided:
+                _sync_leave_rollup(conn, r)
+
+            # Charged to (or refunded from) the year the leave starts in.
+            totals = defaultdict(int)
+            this_year = datetime.now().year
+            for leave_id in accepted:
+                leave = found[leave_id]
+                if status == 'Approved':
+                    sign = 1
+                elif leave['status'] == 'Approved':
+                    sign = -1
+                else:
+                    continue
+                year = _leave_year(leave['start_date'], this_year)
+                totals[(leave['employee_code'], leave['leave_type'], year)] += sign * count_days(leave)
+            for (employee_code, leave_type, year), days in totals.items():
+                column = LEAVE_BALANCE_COLUMNS.get(leave_type)
+                if not column or not days:
+                    continue
+                if days > 0:
+                    # The upsert covers an employee whose year hasn't been opened
+                    # by the rollover job yet.
+                    conn.execute(f"""
+                        INSERT INTO leave_balances (employee_code, year, {column}) VALUES (?, ?, ?)
+                        ON CONFLICT(employee_code, year) DO UPDATE SET {column} = {column} + excluded.{column}
+                    """, (employee_code, year, days))
+                else:
+                    # Holidays added since approval can make the refund larger
+                    # than the charge; never go below zero.
+                    conn.execute(f"""
+                        UPDATE leave_balances SET {column} = max(0, {column} + ?)
+                        WHERE employee_code = ? AND year = ?
+                    """, (days, employee_code, year))
             conn.commit()
+
+            decided = [dict(r) for r in decided]
+            for employee_code in {r['employee_code'] for r in decided}:
+                publish(LEAVES_CHANGED, employee_code=employee_code)
+            return decided, errors
         finally:
             conn.close()
 
@@ -156,34 +330,73 @@ class AttendanceRepository:
         finally:
             conn.close()
 
-    def get_monthly_approved_leaves(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    def get_daily_statuses(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         conn = get_db_connection()
         try:
             rows = conn.execute("""
-                SELECT employee_code, start_date, end_date, leave_type
-                FROM leaves 
-                WHERE status = 'Approved' 
-                AND (
-                    (start_date BETWEEN ? AND ?) OR 
-                    (end_date BETWEEN ? AND ?)
-                )
-            """, (start_date, end_date, start_date, end_date)).fetchall()
+                SELECT employee_code, date, status
+                FROM attendance_daily
+                WHERE date BETWEEN ? AND ?
+            """, (start_date, end_date)).fetchall()
             return [dict(r) for r in rows]
         finally:
             conn.close()
-            
+
+    @retry_on_busy
+    def close_day(self, date: str, status: str, location_statuses: Optional[Dict[str, str]] = None) -> int:
+        """Record `status` for every active employee with nothing final on `date` yet.
+
+        `location_statuses` overrides the status for employees at those
+        (trimmed) locations, e.g. a local holiday.
+        """
+        location_statuses = location_statuses or {}
+        cases = " ".join("WHEN ? THEN ?" for _ in location_statuses)
+        status_sql = f"CASE trim(coalesce(location, '')) {cases} ELSE ? END" if cases else "?"
+        params = [date, *(v for pair in location_statuses.items() for v in pair), status]
+        conn = get_db_connection()
+        try:
+            cur = conn.execute(f"""
+                INSERT INTO attendance_daily (employee_code, date, status)
+                SELECT employee_code, ?, {status_sql} FROM employees
+                WHERE employment_status = 'Active' AND employee_code IS NOT NULL
+                ON CONFLICT(employee_code, date) DO NOTHING
+            """, params)
+            conn.commit()
+            return cur.rowcount
+        finally:
+            conn.close()
+
+    def get_monthly_approved_leaves(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        conn = get_db_connection()
+        try:
+            rows = conn.execute(APPROVED_LEAVES_OVERLAP_SQL, {"start": start_date, "end": end_date}).fetchall()
+            return [dict(r) for r in rows]
+        finally:
+            conn.close()
+
     def get_all_active_employees_basic(self) -> List[Dict[str, Any]]:
         conn = get_db_connection()
         try:
-            rows = conn.execute("SELECT name, employee_code FROM employees WHERE employment_status = 'Active' ORDER BY name").fetchall()
+            rows = conn.execute("SELECT name, employee_code, location FROM employees WHERE employment_status = 'Active' ORDER BY name").fetchall()
             return [dict(r) for r in rows]
         finally:
             conn.close()
 
-    def get_user_role(self, employee_code: str) -> Optional[str]:
+    def get_active_locations(self) -> List[str]:
         conn = get_db_connection()
         try:
-            row = conn.execute("SELECT role FROM users WHERE employee_code = ?", (employee_code,)).fetchone()
-            return row['role'] if row else None
+            rows = conn.execute("""
+                SELECT DISTINCT trim(coalesce(location, '')) AS location FROM employees
+                WHERE employment_status = 'Active'
+            """).fetchall()
+            return [r['location'] for r in rows]
         finally:
-             conn.close()
+            conn.close()
+
+    def get_employee_location(self, employee_code: str) -> Optional[str]:
+        conn = get_db_connection()
+        try:
+            row = conn.execute("SELECT location FROM employees WHERE employee_code = ?", (employee_code,)).fetchone()
+            return row['location'] if row else None
+        finally:
+            conn.close()
@@ -0,0 +1,47 @@
+from typing import List, Dict, Any, Optional
+from backend.database import get_db_connection, retry_on_busy
+from backend.core.events import publish, HOLIDAYS_CHANGED
+
+class CalendarRepository:
+    def get_holidays(self, year: Optional[int] = None, location: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Holidays ordered by date; `location` returns its own plus company-wide ('') ones."""
+        conn = get_db_connection()
+        try:
+            sql = "SELECT location, date, name FROM holidays WHERE 1 = 1"
+            params = []
+            if year is not None:
+                sql += " AND date BETWEEN ? AND ?"
+                params += [f"{year}-01-01", f"{year}-12-31"]
+            if location is not None:
+                sql += " AND location IN ('', ?)"
+                params.append(location)
+            rows = conn.execute(sql + " ORDER BY date, location", params).fetchall()
+            return [dict(r) for r in rows]
+        finally:
+            conn.close()
+
+    @retry_on_busy
+    def upsert_holiday(self, date: str, name: str, location: str = ''):
+        conn = get_db_connection()
+        try:
+            conn.execute('''
+                INSERT INTO holidays (location, date, name) VALUES (?, ?, ?)
+                ON CONFLICT(location, date) DO UPDATE SET name = excluded.name
+            ''', (location, date, name))
+            conn.commit()
+            publish(HOLIDAYS_CHANGED)
+        finally:
+            conn.close()
+
+    @retry_on_busy
+    def delete_holiday(self, date: str, location: str = '') -> bool:
+        conn = get_db_connection()
+        try:
+            cur = conn.execute("DELETE FROM holidays WHERE location = ? AND date = ?", (location, date))
+            conn.commit()
+            if cur.rowcount == 0:
+                return False
+            publish(HOLIDAYS_CHANGED)
+            return True
+        finally:
+            conn.close()
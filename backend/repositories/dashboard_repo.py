@@ -1,73 +1,148 @@
+import json
 import sqlite3
 import pandas as pd
 from typing import Dict, Any, List, Optional
 from backend.database import get_db_connection
+from backend.repositories.attendance_repo import LEAVE_ENTITLEMENTS
+
+# Unparseable doj values are skipped, as the pandas fallback's NaT rows are,
+# and hires are ordered by the parsed date rather than the raw text.
+RECENT_HIRES_SQL = """
+    SELECT name, team, designation, date(doj) as doj_str, location
+    FROM employees
+    WHERE date(doj) IS NOT NULL
+    ORDER BY date(doj) DESC
+    LIMIT ?
+"""
 
 class DashboardRepository:
     def get_all_counts(self) -> Dict[str, Any]:
-        """Fetch raw dataframes for analytics. Returning DF might be heavy but it's what existing logic uses."""
+        """Fetch raw dataframes for analytics (fallback path), projected to the columns the stats use."""
         conn = get_db_connection()
         try:
             return {
-                "employees": pd.read_sql("SELECT * FROM employees", conn),
-                "assets": pd.read_sql("SELECT * FROM assets", conn),
-                "skills": pd.read_sql("SELECT * FROM skill_matrix", conn),
+                "employees": pd.read_sql("SELECT name, team, designation, employment_status, doj, location FROM employees", conn),
+                "assets": pd.read_sql("SELECT ob_laptop, cl_laptop FROM assets", conn),
+                "skills": pd.read_sql("SELECT primary_skillset, experience_years FROM skill_matrix", conn),
             }
         finally:
             conn.close()
 
-    def get_employee_dashboard_data(self, employee_code: str) -> Dict[str, Any]:
+    def get_aggregated_stats(self) -> Dict[str, Dict[str, int]]:
+        """Compute the dashboard counters with GROUP BY queries, same shape as get_materialized_stats()."""
+        queries = {
+            "employees": "SELECT 'total', COUNT(*) FROM employees",
+            "status": "SELECT employment_status, COUNT(*) FROM employees WHERE employment_status IS NOT NULL GROUP BY employment_status",
+            "team": "SELECT team, COUNT(*) FROM employees WHERE team IS NOT NULL GROUP BY team",
+            "designation": "SELECT designation, COUNT(*) FROM employees WHERE designation IS NOT NULL GROUP BY designation",
+            "location": "SELECT location, COUNT(*) FROM employees WHERE location IS NOT NULL GROUP BY location",
+            "hire_year": """
+                SELECT strftime('%Y', doj) AS y, COUNT(*) FROM employees
+                WHERE CAST(strftime('%Y', doj) AS INTEGER) > 1900 GROUP BY y
+            """,
+            "active_doj": """
+                SELECT date(doj) AS d, COUNT(*) FROM employees
+                WHERE employment_status = 'Active' AND date(doj) IS NOT NULL GROUP BY d
+            """,
+            "asset_status": """
+                SELECT CASE WHEN cl_laptop = 1 THEN 'Returned' ELSE 'Assigned' END AS s, COUNT(*) FROM assets
+                WHERE cl_laptop = 1 OR ob_laptop = 1 GROUP BY s
+            """,
+            "experience": """
+                SELECT CASE
+                    WHEN experience_years <= 2 THEN '0-2'
+                    WHEN experience_years <= 5 THEN '3-5'
+                    WHEN experience_years <= 10 THEN '6-10'
+                    WHEN experience_years <= 15 THEN '11-15'
+                    ELSE '16+'
+                END AS r, COUNT(*) FROM skill_matrix
+                WHERE experience_years > 0 AND experience_years <= 100 GROUP BY r
+            """,
+            "skill": """
+                WITH arr AS (
+                    SELECT '["' || replace(replace(replace(primary_skillset, '\\', '\\\\'), '"', '\\"'), ',', '","') || '"]' AS a
+                    FROM skill_matrix WHERE primary_skillset IS NOT NULL
+                )
+                SELECT trim(j.value) AS skill, COUNT(*) AS n
+                FROM arr, json_each(CASE WHEN json_valid(arr.a) THEN arr.a ELSE '[]' END) j
+                WHERE trim(j.value) != ''
+                GROUP BY skill ORDER BY n DESC LIMIT 7
+            """,
+        }
+        conn = get_db_connection()
+        try:
+            stats: Dict[str, Dict[str, int]] = {}
+            for dimension, sql in queries.items():
+                stats[dimension] = {r[0]: r[1] for r in conn.execute(sql).fetchall() if r[1]}
+            return stats
+        finally:
+            conn.close()
+
+    def get_materialized_stats(self) -> Dict[str, Dict[str, int]]:
+        """Counters kept current by the dashboard_stats triggers, as {dimension: {bucket: value}}."""
+        conn = get_db_connection()
+        try:
+            rows = conn.execute("SELECT dimension, bucket, value FROM dashboard_stats WHERE value > 0").fetchall()
+            stats: Dict[str, Dict[str, int]] = {}
+            for r in rows:
+                stats.setdefault(r['dimension'], {})[r['bucket']] = r['value']
+            return stats
+        finally:
+            conn.close()
+
+    def get_recent_hires(self, limit: int = 5) -> List[Dict[str, Any]]:
         conn = get_db_connection()
         try:
-            result = {}
-            # 1. Employee Details
-            c = conn.cursor()
-            c.execute("SELECT * FROM employees WHERE employee_code = ?", (employee_code,))
-            emp = c.fetchone()
-            result['employee'] = dict(emp) if emp else {}
+            rows = conn.execute(RECENT_HIRES_SQL, (limit,)).fetchall()
+            return [dict(r) for r in rows]
+        finally:
+            conn.close()
 
-            # 2. Performance (KRAs)
-            result['kras'] = dict(conn.execute("""
-                SELECT count(*) as total, 
-                       sum(case when status = 'Completed' then 1 else 0 end) as completed
-                FROM kra_assignments 
-                WHERE employee_code = ?
-            """, (employee_code,)).fetchone())
-            
-            # 3. Training (HR Activity)
-            result['training'] = dict(conn.execute("""
-                SELECT count(*) as total,
-                       sum(case when training_status = 'Completed' then 1 else 0 end) as completed
-                FROM hr_activity
-                WHERE employee_code = ?
-            """, (employee_code,)).fetchone())
-            
-            # 4. Assets
-            asset_row = conn.execute("""
-                SELECT 
-                    ob_laptop + ob_laptop_bag + ob_headphones + ob_mouse + ob_extra_hardware + ob_client_assets as total_assigned
-                FROM assets 
-                WHERE employee_code = ?
+    def get_employee_dashboard_data(self, employee_code: str) -> Dict[str, Any]:
+        """Everything the employee home page needs in one statement / one round trip."""
+        conn = get_db_connection()
+        try:
+            row = conn.execute("""
+                SELECT
+                    e.name, e.designation, e.team, e.location, e.doj,
+                    (SELECT count(*) FROM kra_assignments WHERE employee_code = p.code) AS kra_total,
+                    (SELECT sum(case when status = 'Completed' then 1 else 0 end)
+                       FROM kra_assignments WHERE employee_code = p.code) AS kra_completed,
+                    (SELECT count(*) FROM hr_activity WHERE employee_code = p.code) AS training_total,
+                    (SELECT sum(case when training_status = 'Completed' then 1 else 0 end)
+                       FROM hr_activity WHERE employee_code = p.code) AS training_completed,
+                    (SELECT ob_laptop + ob_laptop_bag + ob_headphones + ob_mouse + ob_extra_hardware + ob_client_assets
+                       FROM assets WHERE employee_code = p.code) AS asset_count,
+                    EXISTS(SELECT 1 FROM attendance WHERE employee_code = p.code AND date = date('now')) AS present_today,
+                    (SELECT json_object('sick_used', sick_used, 'sick_total', sick_total,
+                                        'casual_used', casual_used, 'casual_total', casual_total)
+                       FROM leave_balances
+                       WHERE employee_code = p.code AND year = strftime('%Y', 'now')) AS leaves_json,
+                    (SELECT json_group_array(json_object(
+                                'id', id, 'employee_code', employee_code, 'title', title, 'message', message,
+                                'type', type, 'is_read', is_read, 'created_at', created_at))
+                       FROM (SELECT * FROM notifications WHERE employee_code = p.code
+                             ORDER BY created_at DESC LIMIT 5)) AS notifications_json
+                FROM (SELECT ? AS code) p
+                LEFT JOIN employees e ON e.employee_code = p.code
             """, (employee_code,)).fetchone()
-            result['asset_count'] = asset_row['total_assigned'] if asset_row and asset_row['total_assigned'] else 0
-            
-            # 5. Notifications
-            notifs = conn.execute("""
-                SELECT * FROM notifications 
-                WHERE employee_code = ? 
-                ORDER BY created_at DESC 
-                LIMIT 5
-            """, (employee_code,)).fetchall()
-            result['notifications'] = [dict(n) for n in notifs]
-            
-            # 6. Attendance Today
-            att = conn.execute("SELECT 1 FROM attendance WHERE employee_code = ? AND date = date('now')", (employee_code,)).fetchone()
-            result['attendance_status'] = "Present" if att else "Absent"
-            
-            # 7. Leaves
-            balance = conn.execute("SELECT sick_used, sick_total, casual_used, casual_total FROM leave_balances WHERE employee_code = ? AND year = strftime('%Y', 'now')", (employee_code,)).fetchone()
-            result['leaves'] = dict(balance) if balance else {"sick_used": 0, "sick_total": 0, "casual_used": 0, "casual_total": 0}
-            
-            return result
+
+            employee = {k: row[k] for k in ('name', 'designation', 'team', 'location', 'doj')} if row['name'] is not None else {}
+            # json_group_array doesn't promise to keep the subquery's order.
+            notifications = sorted(json.loads(row['notifications_json'] or '[]'),
+                                   key=lambda n: (n['created_at'] or '', n['id']), reverse=True)
+            return {
+                'employee': employee,
+                'kras': {"total": row['kra_total'], "completed": row['kra_completed']},
+                'training': {"total": row['training_total'], "completed": row['training_completed']},
+                'asset_count': row['asset_count'] or 0,
+                'notifications': notifications,
+                'attendance_status': "Present" if row['present_today'] else "Absent",
+                # No row until the rollover job (or a first approved leave) opens the
+                # year; show the plain entitlement, as /api/attendance/leave/balance does.
+                'leaves': json.loads(row['leaves_json']) if row['leaves_json'] else {
+                    "sick_used": 0, "sick_total": LEAVE_ENTITLEMENTS['sick_total'],
+                    "casual_used": 0, "casual_total": LEAVE_ENTITLEMENTS['casual_total']},
+            }
         finally:
             conn.close()
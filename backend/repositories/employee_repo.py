@@ -1,17 +1,76 @@
 import sqlite3
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from backend.database import get_db_connection
+from backend.core.events import publish, EMPLOYEES_CHANGED, ASSETS_CHANGED, SKILLS_CHANGED, USERS_CHANGED
+
+# Directory sort keys; each is paired with employee_code to make the keyset unique.
+DIRECTORY_SORT_KEYS = {
+    "name": "e.name",
+    "employee_code": "e.employee_code",
+    "doj": "ifnull(e.doj, '')",
+}
+
+DIRECTORY_FILTERS = {
+    "team": "e.team",
+    "status": "e.employment_status",
+    "designation": "e.designation",
+    "manager": "e.reporting_manager",
+    "location": "e.location",
+}
 
 class EmployeeRepository:
-    def get_all_employees_basic(self) -> List[Dict[str, Any]]:
+    def get_employees_page(self, filters: Dict[str, Any], sort: str = "name", descending: bool = False,
+                           limit: Optional[int] = None, after: Optional[Tuple[Any, str]] = None) -> List[Dict[str, Any]]:
+        """Directory rows ordered by (sort key, employee_code), starting after the
+        `after` keyset position. Each row carries its `sort_key` for building cursors."""
+        key = DIRECTORY_SORT_KEYS[sort]
+        direction = "DESC" if descending else "ASC"
+        where, params = [], []
+        for name, value in filters.items():
+            if value is not None:
+                where.append(f"{DIRECTORY_FILTERS[name]} = ?")
+                params.append(value)
+        if after is not None:
+            op = '<' if descending else '>'
+            # The redundant bound on the key alone lets SQLite seek an
+            # expression index; the row value handles ties on employee_code.
+            where.append(f"{key} {op}= ? AND ({key}, e.employee_code) {op} (?, ?)")
+            params.extend([after[0], *after])
+
+        query = f"""
+            SELECT e.employee_code, e.name, e.designation, e.team, e.reporting_manager, e.email_id, e.photo_path, e.employment_status, e.exit_date, u.role,
+                   {key} AS sort_key
+            FROM employees e
+            LEFT JOIN users u ON e.employee_code = u.employee_code
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY {key} {direction}, e.employee_code {direction}
+        """
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        conn = get_db_connection()
+        try:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+        finally:
+            conn.close()
+
+    def search_employees(self, match: str, limit: int) -> List[Dict[str, Any]]:
+        """Best bm25 matches for an FTS5 query; name hits weigh most, then code and skills."""
         conn = get_db_connection()
         try:
             rows = conn.execute("""
-                SELECT e.employee_code, e.name, e.designation, e.team, e.reporting_manager, e.email_id, e.photo_path, e.employment_status, e.exit_date, u.role
-                FROM employees e
+                SELECT e.employee_code, e.name, e.designation, e.team, e.location, e.reporting_manager, e.email_id,
+                       e.photo_path, e.employment_status, e.exit_date, u.role,
+                       s.primary_skillset, s.secondary_skillset
+                FROM employee_search s
+                JOIN employees e ON e.id = s.rowid
                 LEFT JOIN users u ON e.employee_code = u.employee_code
-            """).fetchall()
-            return [dict(row) for row in rows]
+                WHERE employee_search MATCH ?
+                ORDER BY bm25(employee_search, 5.0, 10.0, 3.0, 2.0, 2.0, 4.0, 2.0)
+                LIMIT ?
+            """, (match, limit)).fetchall()
+            return [dict(r) for r in rows]
         finally:
             conn.close()
 
@@ -77,6 +136,46 @@ class EmployeeRepository:
         finally:
             conn.close()
 
+    def get_employee_full_profile(self, employee_code: str) -> Optional[Dict[str, Any]]:
+        """Employee row plus skills, assets, training and assessments read on one
+        connection inside a single read transaction, so the sections agree."""
+        conn = get_db_connection()
+        # A nested borrow is already inside the caller's transaction, which
+        # gives the same consistent view; only open (and end) one of our own.
+        began = not conn.in_transaction
+        try:
+            if began:
+                conn.execute("BEGIN")
+            row = conn.execute("""
+                SELECT e.*,
+                       (SELECT coalesce(round(avg(total_score), 1), 0)
+                          FROM quarterly_assessments
+                         WHERE employee_code = e.employee_code AND status = 'Finalized') AS average_score
+                FROM employees e
+                WHERE e.employee_code = ?
+            """, (employee_code,)).fetchone()
+            if not row:
+                return None
+            employee = dict(row)
+
+            skills = conn.execute("SELECT * FROM skill_matrix WHERE employee_code = ?", (employee_code,)).fetchone()
+            employee['skill_matrix'] = dict(skills) if skills else {}
+            employee['assets'] = [dict(r) for r in conn.execute(
+                "SELECT * FROM assets WHERE employee_code = ?", (employee_code,)).fetchall()]
+            employee['training'] = [dict(r) for r in conn.execute(
+                "SELECT * FROM hr_activity WHERE employee_code = ?", (employee_code,)).fetchall()]
+            employee['assessments'] = [dict(r) for r in conn.execute("""
+                SELECT id, year, quarter, status, total_score, percentage, updated_at
+                FROM quarterly_assessments
+                WHERE employee_code = ?
+                ORDER BY year DESC, quarter DESC
+            """, (employee_code,)).fetchall()]
+            return employee
+        finally:
+            if began:
+                conn.rollback()
+            conn.close()
+
     def create_employee(self, data: Dict[str, Any]):
         conn = get_db_connection()
         try:
@@ -119,6 +218,9 @@ class EmployeeRepository:
             ''', (data['code'], ob_pf_val, ob_med_val))
             
             conn.commit()
+            publish(EMPLOYEES_CHANGED, employee_code=data['code'])
+            publish(SKILLS_CHANGED, employee_code=data['code'])
+            publish(ASSETS_CHANGED, employee_code=data['code'])
         finally:
             conn.close()
 
@@ -129,6 +231,7 @@ class EmployeeRepository:
             query = f"UPDATE employees SET {', '.join(fields)} WHERE employee_code = ?"
             conn.execute(query, tuple(values))
             conn.commit()
+            publish(EMPLOYEES_CHANGED, employee_code=employee_code)
         finally:
             conn.close()
 
@@ -154,6 +257,7 @@ class EmployeeRepository:
                 conn.execute("INSERT INTO skill_matrix (employee_code, primary_skillset, secondary_skillset) VALUES (?, ?, ?)", 
                           (employee_code, primary or '', secondary or ''))
             conn.commit()
+            publish(SKILLS_CHANGED, employee_code=employee_code)
         finally:
             conn.close()
 
@@ -166,6 +270,9 @@ class EmployeeRepository:
             conn.execute("DELETE FROM hr_activity WHERE employee_code = ?", (employee_code,))
             conn.execute("DELETE FROM employees WHERE employee_code = ?", (employee_code,))
             conn.commit()
+            publish(EMPLOYEES_CHANGED, employee_code=employee_code)
+            publish(SKILLS_CHANGED, employee_code=employee_code)
+            publish(ASSETS_CHANGED, employee_code=employee_code)
         finally:
             conn.close()
 
@@ -201,5 +308,7 @@ class EmployeeRepository:
             
             conn.execute("UPDATE users SET is_active = 0 WHERE employee_code = ?", (employee_code,))
             conn.commit()
+            publish(EMPLOYEES_CHANGED, employee_code=employee_code)
+            publish(USERS_CHANGED, employee_code=employee_code)
         finally:
             conn.close()
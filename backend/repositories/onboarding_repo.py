@@ -1,5 +1,6 @@
 from typing import Dict, Any, List, Optional
 from backend.database import get_db_connection
+from backend.core.events import publish, EMPLOYEES_CHANGED, SKILLS_CHANGED, USERS_CHANGED
 
 class OnboardingRepository:
     def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
@@ -93,6 +94,8 @@ class OnboardingRepository:
             
             conn.execute("UPDATE users SET is_active = 1 WHERE employee_code = ?", (employee_code,))
             conn.commit()
+            publish(EMPLOYEES_CHANGED, employee_code=employee_code)
+            publish(USERS_CHANGED, employee_code=employee_code)
         finally:
             conn.close()
 
@@ -155,6 +158,8 @@ class OnboardingRepository:
             ))
             
             conn.commit()
+            publish(EMPLOYEES_CHANGED, employee_code=employee_data['code'])
+            publish(SKILLS_CHANGED, employee_code=employee_data['code'])
         except:
             conn.rollback()
             raise
@@ -1,6 +1,7 @@
 import sqlite3
 from typing import Dict, Any, List, Optional
 from backend.database import get_db_connection
+from backend.core.events import publish, TRAINING_CHANGED
 
 class TrainingRepository:
     def get_all_programs(self) -> List[Dict[str, Any]]:
@@ -40,6 +41,7 @@ class TrainingRepository:
                 ) VALUES (?, ?, ?, ?, ?, 'Pending')
             """, (code, prog_id, prog_name, date, duration))
             conn.commit()
+            publish(TRAINING_CHANGED, employee_code=code)
         finally:
             conn.close()
 
@@ -68,11 +70,14 @@ class TrainingRepository:
     def update_assignment_status(self, id: int, status: str):
         conn = get_db_connection()
         try:
-            conn.execute("""
+            rows = conn.execute("""
                 UPDATE hr_activity 
                 SET training_status = ? 
                 WHERE id = ?
-            """, (status, id))
+                RETURNING employee_code
+            """, (status, id)).fetchall()
             conn.commit()
+            for r in rows:
+                publish(TRAINING_CHANGED, employee_code=r['employee_code'])
         finally:
             conn.close()
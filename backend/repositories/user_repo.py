@@ -1,5 +1,6 @@
 from typing import Optional, Dict, Any, List
-from backend.database import get_db_connection
+from backend.database import get_db_connection, retry_on_busy
+from backend.core.events import publish, USERS_CHANGED
 
 class UserRepository:
     def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
@@ -37,6 +38,7 @@ class UserRepository:
         finally:
             conn.close()
 
+    @retry_on_busy
     def update_last_login(self, username: str):
         conn = get_db_connection()
         try:
@@ -58,14 +60,19 @@ class UserRepository:
         try:
             conn.execute("DELETE FROM users WHERE username = ?", (username,))
             conn.commit()
+            publish(USERS_CHANGED, username=username)
         finally:
             conn.close()
             
-    # Session Management (If we move to DB sessions totally)
-    def create_session(self, session_token: str, user_id: int):
+    # Session Management
+    @retry_on_busy
+    def create_session(self, session_token: str, user_id: int, expires_at: str):
         conn = get_db_connection()
         try:
-             conn.execute("INSERT INTO sessions (session_token, user_id) VALUES (?, ?)", (session_token, user_id))
+             conn.execute(
+                 "INSERT INTO sessions (session_token, user_id, expires_at) VALUES (?, ?, ?)",
+                 (session_token, user_id, expires_at)
+             )
              conn.commit()
         finally:
              conn.close()
@@ -78,6 +85,20 @@ class UserRepository:
         finally:
              conn.close()
 
+    def get_session_user(self, session_token: str, now: str) -> Optional[Dict[str, Any]]:
+        conn = get_db_connection()
+        try:
+             row = conn.execute("""
+                SELECT s.expires_at, u.id, u.username, u.role, u.employee_code
+                FROM sessions s
+                JOIN users u ON u.id = s.user_id
+                WHERE s.session_token = ? AND s.expires_at > ? AND u.is_active = 1
+             """, (session_token, now)).fetchone()
+             return dict(row) if row else None
+        finally:
+             conn.close()
+
+    @retry_on_busy
     def delete_session(self, session_token: str):
         conn = get_db_connection()
         try:
@@ -85,3 +106,13 @@ class UserRepository:
              conn.commit()
         finally:
             conn.close()
+
+    @retry_on_busy
+    def delete_expired_sessions(self, now: str) -> int:
+        conn = get_db_connection()
+        try:
+             cur = conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+             conn.commit()
+             return cur.rowcount
+        finally:
+            conn.close()
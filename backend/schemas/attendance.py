@@ -16,10 +16,20 @@ class LeaveActionRequest(BaseModel):
     action: str
     reason: Optional[str] = None
 
+class BulkLeaveActionRequest(BaseModel):
+    leave_ids: List[int]
+    action: str
+    reason: Optional[str] = None
+
+class HolidayRequest(BaseModel):
+    date: str
+    name: str
+    location: Optional[str] = None # None/empty = company-wide
+
 # --- Response Schemas ---
 
 class AttendanceRecord(BaseModel):
-    id: int
+    id: Optional[int] = None # None while a write-behind clock-in is still queued
     employee_code: str
     date: str
     clock_in: Optional[str]
@@ -1,6 +1,8 @@
 from typing import List, Dict, Any
 from backend.repositories.admin_repo import AdminRepository
 from backend.services.auth_service import AuthService # Reuse for create/delete user logic
+from backend.core.cache import cache_stats
+from backend.database import db_session
 
 class AdminService:
     def __init__(self):
@@ -32,10 +34,16 @@ class AdminService:
         if username == actor:
             raise ValueError("Cannot delete your own account")
             
-        self.auth_service.delete_user(username)
-        self.repo.log_action(actor, "DELETE_USER", f"Deleted user {username}")
+        # The user and its audit entry go together or not at all.
+        with db_session():
+            self.auth_service.delete_user(username)
+            self.repo.log_action(actor, "DELETE_USER", f"Deleted user {username}")
         
         return {"message": f"User {username} deleted"}
 
-    def get_logs(self):
-        return self.repo.get_logs()
+    def get_logs(self, conn=None):
+        return self.repo.get_logs(conn=conn)
+
+    def get_cache_stats(self):
+        # Counters are per worker process.
+        return cache_stats()
@@ -1,18 +1,309 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime
+from itertools import islice
 import calendar
-from typing import List, Dict, Any, Optional
-from backend.repositories.attendance_repo import AttendanceRepository
+import json
+import os
+from typing import List, Dict, Any, Iterator, Optional
+import numpy as np
+import threading
+from backend.repositories.attendance_repo import AttendanceRepository, LEAVE_ENTITLEMENTS
+from backend.database import is_busy_error
+from backend.services.calendar_service import (
+    CalendarService, normalize_location, WORKING as WORKING_DAY, WEEKEND as WEEKEND_DAY, HOLIDAY as HOLIDAY_DAY
+)
+from backend.core.write_behind import WriteBehindQueue
+from backend.core.cache import TTLCache, register_cache
+from backend.core.events import subscribe, LEAVES_CHANGED, EMPLOYEES_CHANGED
 from backend.schemas.attendance import (
     ClockOutRequest, LeaveRequest, AttendanceStatus, LeaveBalance
 )
 
+# "rollup" reads the attendance_daily table; "raw" recomputes from attendance
+# and leaves (useful to cross-check the rollup).
+ATTENDANCE_SUMMARY_SOURCE = os.environ.get("ATTENDANCE_SUMMARY_SOURCE", "rollup")
+
+ABSENT, PRESENT, LEAVE, WEEKEND, FUTURE, PENDING, HOLIDAY = range(7)
+STATUS_LABELS = ('Absent', 'Present', 'Leave', 'Weekend', 'Future', 'Pending', 'Holiday')
+# One letter per status for the compact summary format ("T" = today, not yet clocked in).
+COMPACT_CODES = 'APLWFTH'
+# Status recorded for a day nobody worked, by calendar day kind.
+DAY_KIND_STATUS = {WORKING_DAY: ABSENT, WEEKEND_DAY: WEEKEND, HOLIDAY_DAY: HOLIDAY}
+SUMMARY_STREAM_CHUNK = 500
+
+def _leave_day_range(start: str, end: str, month_start: date):
+    try:
+        d1 = datetime.strptime(start, '%Y-%m-%d').date()
+        d2 = datetime.strptime(end, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+    return (d1 - month_start).days, (d2 - month_start).days
+
+def monthly_status_matrix(employees: List[Dict[str, Any]], attendance_rows: List[Dict[str, Any]],
+                          leave_rows: List[Dict[str, Any]], year: int, month: int,
+                          today: Optional[date] = None, day_kinds: Optional[np.ndarray] = None) -> np.ndarray:
+    """(employees x days) matrix of status codes (indexes into STATUS_LABELS).
+
+    Precedence per cell: Present, then approved Leave, then the calendar
+    (Weekend / Holiday / Future / Pending for today / Absent).
+    """
+    num_days = calendar.monthrange(year, month)[1]
+    first_day = date(year, month, 1)
+    codes = {emp['employee_code']: i for i, emp in enumerate(employees)}
+    n = len(employees)
+
+    present = np.zeros((n, num_days), dtype=bool)
+    day_of = {d: i for i, d in enumerate(month_dates(year, month))}
+    rows = np.fromiter((codes.get(r['employee_code'], -1) for r in attendance_rows), dtype=np.int64, count=len(attendance_rows))
+    cols = np.fromiter((day_of.get(r['date'], -1) for r in attendance_rows), dtype=np.int64, count=len(attendance_rows))
+    known = (rows >= 0) & (cols >= 0)
+    present[rows[known], cols[known]] = True
+
+    # Leave ranges become +1/-1 markers clipped to the month; a cumulative sum
+    # along the day axis turns them into per-day coverage.
+    coverage = np.zeros((n, num_days + 1), dtype=np.int32)
+    for r in leave_rows:
+        row = codes.get(r['employee_code'])
+        span = _leave_day_range(r['start_date'], r['end_date'], first_day)
+        if row is None or span is None:
+            continue
+        first, last = max(span[0], 0), min(span[1], num_days - 1)
+        if first <= last:
+            coverage[row, first] += 1
+            coverage[row, last + 1] -= 1
+    on_leave = np.cumsum(coverage[:, :num_days], axis=1) > 0
+
+    defaults = calendar_statuses(year, month, today, day_kinds)
+    return np.where(present, PRESENT, np.where(on_leave, LEAVE, defaults)).astype(np.int8)
+
+def calendar_statuses(year: int, month: int, today: Optional[date] = None,
+                      day_kinds: Optional[np.ndarray] = None) -> np.ndarray:
+    """Status of each day of the month for someone with no attendance or leave.
+
+    `day_kinds` holds calendar_service day kinds, per day or per employee x
+    day; without it Saturday and Sunday are the only days off.
+    """
+    num_days = calendar.monthrange(year, month)[1]
+    today64 = np.datetime64(today or datetime.now().date(), 'D')
+    dates = np.datetime64(date(year, month, 1), 'D') + np.arange(num_days)
+    if day_kinds is None:
+        weekday = (dates.view('int64') - 4) % 7  # 1970-01-01 was a Thursday
+        day_kinds = np.where(weekday >= 5, WEEKEND_DAY, WORKING_DAY)
+    return np.select(
+        [day_kinds == WEEKEND_DAY, day_kinds == HOLIDAY_DAY, dates > today64, dates == today64],
+        [WEEKEND, HOLIDAY, FUTURE, PENDING],
+        default=ABSENT
+    )
+
+def rollup_status_matrix(employees: List[Dict[str, Any]], daily_rows: List[Dict[str, Any]],
+                         year: int, month: int, today: Optional[date] = None,
+                         day_kinds: Optional[np.ndarray] = None) -> np.ndarray:
+    """Same matrix as monthly_status_matrix, read from attendance_daily.
+
+    Rollup rows are final and are scattered over the calendar defaults, which
+    cover days not closed yet.
+    """
+    n = len(employees)
+    defaults = calendar_statuses(year, month, today, day_kinds)
+    status = np.broadcast_to(defaults, (n, defaults.shape[-1])).astype(np.int8)
+    codes = {emp['employee_code']: i for i, emp in enumerate(employees)}
+    day_of = {d: i for i, d in enumerate(month_dates(year, month))}
+    label_code = {label: i for i, label in enumerate(STATUS_LABELS)}
+    count = len(daily_rows)
+    rows = np.fromiter((codes.get(r['employee_code'], -1) for r in daily_rows), dtype=np.int64, count=count)
+    cols = np.fromiter((day_of.get(r['date'], -1) for r in daily_rows), dtype=np.int64, count=count)
+    vals = np.fromiter((label_code.get(r['status'], -1) for r in daily_rows), dtype=np.int64, count=count)
+    known = (rows >= 0) & (cols >= 0) & (vals >= 0)
+    status[rows[known], cols[known]] = vals[known]
+    return status
+
+def month_dates(year: int, month: int) -> List[str]:
+    return [f"{year}-{month:02d}-{d:02d}" for d in range(1, calendar.monthrange(year, month)[1] + 1)]
+
+def _status_counts(status: np.ndarray):
+    return ((status == PRESENT).sum(axis=1), (status == LEAVE).sum(axis=1), (status == ABSENT).sum(axis=1))
+
+def _full_rows(employees: List[Dict[str, Any]], status: np.ndarray, year: int, month: int):
+    date_strs = month_dates(year, month)
+    num_days = len(date_strs)
+    present_count, leave_count, absent_count = _status_counts(status)
+
+    # One cell dict per (status, day), shared by every row that needs it, so
+    # the grid is a single fancy-index instead of employees x days dict builds.
+    cell_table = np.empty((len(STATUS_LABELS), num_days), dtype=object)
+    for code, label in enumerate(STATUS_LABELS):
+        for d in range(num_days):
+            cell_table[code, d] = {"day": d + 1, "status": label, "date": date_strs[d]}
+    cells = cell_table[status, np.arange(num_days)]
+
+    for i, emp in enumerate(employees):
+        yield {
+            "name": emp['name'],
+            "code": emp['employee_code'],
+            "days": cells[i].tolist(),
+            "stats": {"present": int(present_count[i]), "leave": int(leave_count[i]), "absent": int(absent_count[i])}
+        }
+
+def _compact_rows(employees: List[Dict[str, Any]], status: np.ndarray):
+    present_count, leave_count, absent_count = _status_counts(status)
+    # Each row's codes become one ASCII string via a fixed-width bytes view.
+    letters = np.frombuffer(COMPACT_CODES.encode(), dtype=np.uint8)[status]
+    days = np.ascontiguousarray(letters).view(f"S{status.shape[1]}").ravel() if status.size else [b""] * len(employees)
+    for i, emp in enumerate(employees):
+        yield {
+            "name": emp['name'],
+            "code": emp['employee_code'],
+            "days": days[i].decode(),
+            "stats": {"present": int(present_count[i]), "leave": int(leave_count[i]), "absent": int(absent_count[i])}
+        }
+
+def build_monthly_summary(employees: List[Dict[str, Any]], attendance_rows: List[Dict[str, Any]],
+                          leave_rows: List[Dict[str, Any]], year: int, month: int,
+                          today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """Per-employee day grid for a month, as returned by /admin/summary."""
+    status = monthly_status_matrix(employees, attendance_rows, leave_rows, year, month, today)
+    return list(_full_rows(employees, status, year, month))
+
+def iter_monthly_summary_json(employees: List[Dict[str, Any]], status: np.ndarray, year: int, month: int,
+                              compact: bool = False, chunk_size: int = SUMMARY_STREAM_CHUNK) -> Iterator[str]:
+    """Serialize the summary a chunk of employees at a time.
+
+    Full mode yields the same JSON array as build_monthly_summary. Compact mode
+    yields one object with the month header, a legend and per-employee status
+    strings (one character per day).
+    """
+    if compact:
+        header = {
+            "year": year,
+            "month": month,
+            "dates": month_dates(year, month),
+            "legend": dict(zip(COMPACT_CODES, STATUS_LABELS)),
+        }
+        yield json.dumps(header)[:-1] + ', "employees": ['
+        rows = _compact_rows(employees, status)
+    else:
+        yield "["
+        rows = _full_rows(employees, status, year, month)
+
+    first = True
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        body = ", ".join(json.dumps(row) for row in chunk)
+        yield body if first else ", " + body
+        first = False
+    yield "]}" if compact else "]"
+
+# Write-behind clock-ins: punches are acknowledged straight away and inserted
+# in batched transactions. Opt-in, since a punch is only durable once its batch
+# commits (the queue is drained on shutdown).
+ATTENDANCE_WRITE_BEHIND = os.environ.get("ATTENDANCE_WRITE_BEHIND", "0").lower() in ("1", "true", "yes")
+ATTENDANCE_FLUSH_ROWS = int(os.environ.get("ATTENDANCE_FLUSH_ROWS", "500"))
+ATTENDANCE_FLUSH_MS = float(os.environ.get("ATTENDANCE_FLUSH_MS", "200"))
+# Tries a punch gets on its own (after its batch failed) before it's dropped.
+ATTENDANCE_FLUSH_ATTEMPTS = int(os.environ.get("ATTENDANCE_FLUSH_ATTEMPTS", "3"))
+
+MAX_BULK_LEAVE_ACTIONS = 500
+# Unused privilege days that roll into the next leave year.
+LEAVE_CARRY_FORWARD_MAX = int(os.environ.get("LEAVE_CARRY_FORWARD_MAX", "15"))
+
+# Leave balances (current year, per employee) and the pending-leave queue are
+# polled by the frontend. Leave writes in this process clear them; the TTL
+# bounds staleness from writes on other workers.
+LEAVE_CACHE_TTL = float(os.environ.get("LEAVE_CACHE_TTL", "30"))
+LEAVE_BALANCE_CACHE_SIZE = int(os.environ.get("LEAVE_BALANCE_CACHE_SIZE", "5000"))
+
+_leave_balance_cache = register_cache("leave_balances", TTLCache(maxsize=LEAVE_BALANCE_CACHE_SIZE, ttl=LEAVE_CACHE_TTL))
+_pending_leaves_cache = register_cache("pending_leaves", TTLCache(maxsize=1, ttl=LEAVE_CACHE_TTL))
+
+def invalidate_leave_caches(employee_code: str = None, **_):
+    _pending_leaves_cache.clear()
+    if employee_code is None:
+        _leave_balance_cache.clear()
+    else:
+        _leave_balance_cache.delete((employee_code, datetime.now().year))
+
+def invalidate_pending_leaves(**_):
+    # The queue carries employee names.
+    _pending_leaves_cache.clear()
+
+subscribe(LEAVES_CHANGED, invalidate_leave_caches)
+subscribe(EMPLOYEES_CHANGED, invalidate_pending_leaves)
+
+class PunchBuffer:
+    """Clock-ins waiting to be written, visible to status checks until they commit."""
+
+    def __init__(self, repo: AttendanceRepository):
+        self.repo = repo
+        self._pending: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.queue = WriteBehindQueue(self._write, max_batch=ATTENDANCE_FLUSH_ROWS,
+                                      max_delay=ATTENDANCE_FLUSH_MS / 1000, name="clock-in",
+                                      max_attempts=ATTENDANCE_FLUSH_ATTEMPTS, on_drop=self._dropped,
+                                      is_transient=is_busy_error)
+
+    def add(self, employee_code: str, date: str, time: str, ip: str) -> bool:
+        key = (employee_code, date)
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending[key] = {"employee_code": employee_code, "date": date, "clock_in": time,
+                                  "clock_out": None, "ip_address": ip, "status": "Present", "work_log": None}
+        self.queue.put((employee_code, date, time, ip))
+        return True
+
+    def get(self, employee_code: str, date: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._pending.get((employee_code, date))
+            return dict(record) if record else None
+
+    def _write(self, batch: List[tuple]):
+        self.repo.clock_in_many(batch)
+        with self._lock:
+            for employee_code, date, _, _ in batch:
+                self._pending.pop((employee_code, date), None)
+
+    def _dropped(self, punch: tuple, error: Exception):
+        # Stop reporting a clock-in that will never be written.
+        with self._lock:
+            self._pending.pop((punch[0], punch[1]), None)
+
+    def flush(self):
+        self.queue.flush()
+
+    def close(self):
+        self.queue.close()
+
+_punch_buffer: Optional[PunchBuffer] = None
+_punch_buffer_lock = threading.Lock()
+
+def get_punch_buffer() -> Optional[PunchBuffer]:
+    global _punch_buffer
+    if not ATTENDANCE_WRITE_BEHIND:
+        return None
+    if _punch_buffer is None:
+        with _punch_buffer_lock:
+            if _punch_buffer is None:
+                _punch_buffer = PunchBuffer(AttendanceRepository())
+    return _punch_buffer
+
+def close_punch_buffer():
+    if _punch_buffer is not None:
+        _punch_buffer.close()
+
 class AttendanceService:
     def __init__(self):
         self.repo = AttendanceRepository()
+        self.calendar = CalendarService()
+
+    def _todays_record(self, employee_code: str, today: str) -> Optional[Dict[str, Any]]:
+        buffer = get_punch_buffer()
+        record = buffer.get(employee_code, today) if buffer else None
+        return record or self.repo.get_todays_attendance(employee_code, today)
 
     def get_status(self, employee_code: str) -> AttendanceStatus:
         today = datetime.now().strftime('%Y-%m-%d')
-        record = self.repo.get_todays_attendance(employee_code, today)
+        record = self._todays_record(employee_code, today)
         
         if not record:
             return AttendanceStatus(status="not_started", data=None)
@@ -27,51 +318,88 @@ class AttendanceService:
     def clock_in(self, employee_code: str, ip_address: str):
         today = datetime.now().strftime('%Y-%m-%d')
         now = datetime.now().strftime('%H:%M:%S')
-        
-        existing = self.repo.get_todays_attendance(employee_code, today)
-        if existing:
+
+        buffer = get_punch_buffer()
+        if buffer:
+            # Duplicates are caught against the buffer and the table here; the
+            # batched INSERT ... DO NOTHING covers races with other workers.
+            if (buffer.get(employee_code, today) or self.repo.get_todays_attendance(employee_code, today)
+                    or not buffer.add(employee_code, today, now, ip_address)):
+                raise ValueError("Already clocked in for today")
+        elif not self.repo.clock_in(employee_code, today, now, ip_address):
             raise ValueError("Already clocked in for today")
-            
-        self.repo.clock_in(employee_code, today, now, ip_address)
         return {"success": True, "message": "Clocked in successfully", "time": now}
 
     def clock_out(self, employee_code: str, data: ClockOutRequest):
         today = datetime.now().strftime('%Y-%m-%d')
         now = datetime.now().strftime('%H:%M:%S')
-        
-        record = self.repo.get_todays_attendance(employee_code, today)
-        if not record:
-             raise ValueError("No attendance record found for today. Please clock in first.")
-        
-        if record.get('clock_out'):
-             raise ValueError("Already clocked out.")
 
-        self.repo.clock_out(employee_code, today, now, data.work_log)
+        buffer = get_punch_buffer()
+        if buffer and buffer.get(employee_code, today):
+            buffer.flush()
+
+        if not self.repo.clock_out(employee_code, today, now, data.work_log):
+            # Only the failure path reads, to tell the two cases apart.
+            if self.repo.get_todays_attendance(employee_code, today):
+                raise ValueError("Already clocked out.")
+            raise ValueError("No attendance record found for today. Please clock in first.")
         return {"success": True, "message": "Clocked out successfully"}
 
     def get_history(self, employee_code: str):
         return self.repo.get_history(employee_code)
 
-    def get_leave_balance(self, employee_code: str) -> Dict[str, Any]:
-        year = datetime.now().year
+    def get_leave_balance(self, employee_code: str, year: Optional[int] = None) -> Dict[str, Any]:
+        current_year = datetime.now().year
+        year = year or current_year
+        # Only the current year is cached; that's what gets polled.
+        key = (employee_code, year)
+        if year == current_year:
+            cached = _leave_balance_cache.get(key)
+            if cached is not None:
+                return cached
+
         balance = self.repo.get_leave_balance(employee_code, year)
-        
         if not balance:
-            self.repo.create_leave_balance(employee_code, year)
-            balance = self.repo.get_leave_balance(employee_code, year)
-            
+            # Years are opened by the rollover job (or the first approved leave);
+            # until then the employee simply has the plain entitlement.
+            balance = {
+                "employee_code": employee_code, "year": year, **LEAVE_ENTITLEMENTS,
+                "sick_used": 0, "casual_used": 0, "privilege_used": 0, "privilege_carried": 0
+            }
+        if year == current_year:
+            _leave_balance_cache.set(key, balance)
         return balance
 
+    def open_leave_year(self, year: int) -> int:
+        return self.repo.open_leave_year(year, LEAVE_CARRY_FORWARD_MAX)
+
     def apply_leave(self, employee_code: str, req: LeaveRequest):
-        balance = self.get_leave_balance(employee_code) # Ensures balance record exists
-        
-        # Validate Balance
+        # Reject bad input before touching the database.
+        try:
+            start = datetime.strptime(req.start_date, '%Y-%m-%d').date()
+            end = datetime.strptime(req.end_date, '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError("Invalid leave dates, expected YYYY-MM-DD")
+        if end < start:
+            raise ValueError("End date cannot be before start date")
+
+        location = self.repo.get_employee_location(employee_code)
+        days = self.calendar.working_days(start, end, location)
+        if days == 0:
+            raise ValueError("The selected dates contain no working days")
+        # Checked against the year the leave starts in, as approval charges it.
+        balance = self.get_leave_balance(employee_code, start.year)
+
+        # Validate Balance (privilege_total already includes carried-forward days)
         if req.leave_type.lower() == 'sick':
-            if balance['sick_used'] >= balance['sick_total']:
+            if balance['sick_used'] + days > balance['sick_total']:
                 raise ValueError("Insufficient Sick Leave balance")
         elif req.leave_type.lower() == 'casual':
-             if balance['casual_used'] >= balance['casual_total']:
+             if balance['casual_used'] + days > balance['casual_total']:
                 raise ValueError("Insufficient Casual Leave balance")
+        elif req.leave_type.lower() == 'privilege':
+            if balance['privilege_used'] + days > balance['privilege_total']:
+                raise ValueError("Insufficient Privilege Leave balance")
         
         self.repo.create_leave_request(employee_code, req.start_date, req.end_date, req.leave_type, req.reason)
         return {"success": True, "message": "Leave application submitted successfully"}
@@ -80,127 +408,109 @@ class AttendanceService:
         return self.repo.get_employee_leaves(employee_code)
 
     def get_all_pending_leaves(self):
-        return self.repo.get_all_pending_leaves()
+        leaves = _pending_leaves_cache.get("pending")
+        if leaves is None:
+            leaves = self.repo.get_all_pending_leaves()
+            _pending_leaves_cache.set("pending", leaves)
+        return leaves
 
     def get_daily_log(self, date: Optional[str] = None):
         target_date = date or datetime.now().strftime('%Y-%m-%d')
         return self.repo.get_daily_log(target_date)
 
-    def approve_reject_leave(self, leave_id: int, action: str, reason: Optional[str], admin_role: str, admin_code: Optional[str]):
-        leave = self.repo.get_leave_by_id(leave_id)
-        if not leave:
-            raise ValueError("Leave request not found")
+    def _leave_action_check(self, admin_role: str, admin_code: Optional[str], action: str):
+        def check(leave: Dict[str, Any]) -> Optional[str]:
+            # 1. Prevent Self-Approval
+            if admin_code and leave['employee_code'] == admin_code:
+                return "You cannot approve your own leave request."
+            # 2. Hierarchy Check
+            if leave['applicant_role'] == 'HR' and admin_role != 'Admin':
+                return "HR leave requests can only be approved by an Administrator."
+            # 3. Pending leaves can be decided; an approved one can still be
+            #    rejected (its days are refunded). Anything else would charge
+            #    or refund the balance twice.
+            if leave['status'] != 'Pending' and not (leave['status'] == 'Approved' and action == 'Rejected'):
+                return f"Leave request has already been {leave['status'].lower()}."
+            return None
+        return check
 
-        # 1. Prevent Self-Approval
-        if admin_code and leave['employee_code'] == admin_code:
-            raise ValueError("You cannot approve your own leave request.")
+    def _leave_days(self, leave: Dict[str, Any]) -> int:
+        """Working days an approved leave is charged, by the employee's location calendar."""
+        try:
+            return self.calendar.working_days(leave['start_date'], leave['end_date'], leave['location'])
+        except (TypeError, ValueError):
+            # Unparseable dates on old rows cost a single day.
+            return 1
 
-        # 2. Hierarchy Check
-        applicant_role = self.repo.get_user_role(leave['employee_code'])
-        if applicant_role == 'HR' and admin_role != 'Admin':
-             raise ValueError("HR leave requests can only be approved by an Administrator.")
+    def approve_reject_leave(self, leave_id: int, action: str, reason: Optional[str], admin_role: str, admin_code: Optional[str]):
+        decided, errors = self.repo.decide_leaves([leave_id], action, reason, self._leave_action_check(admin_role, admin_code, action),
+                                                   self._leave_days)
+        if errors:
+            raise ValueError(errors[leave_id])
+        return {"success": True, "message": f"Leave has been {action}"}
 
-        self.repo.update_leave_status(leave_id, action, reason)
-        
-        if action == 'Approved':
-            # Calculate days
-            days = 1
-            try:
-                d1 = datetime.strptime(leave['start_date'], '%Y-%m-%d')
-                d2 = datetime.strptime(leave['end_date'], '%Y-%m-%d')
-                days = (d2 - d1).days + 1
-            except:
-                pass
-
-            col_map = {'Sick': 'sick_used', 'Casual': 'casual_used', 'Privilege': 'privilege_used'}
-            col = col_map.get(leave['leave_type'])
-            
-            if col:
-                self.repo.update_leave_balance(leave['employee_code'], col, days)
+    def bulk_approve_reject_leaves(self, leave_ids: List[int], action: str, reason: Optional[str], admin_role: str, admin_code: Optional[str]):
+        leave_ids = list(dict.fromkeys(leave_ids))
+        if not leave_ids:
+            raise ValueError("No leave requests selected")
+        if len(leave_ids) > MAX_BULK_LEAVE_ACTIONS:
+            raise ValueError(f"At most {MAX_BULK_LEAVE_ACTIONS} leave requests can be processed at once")
 
-        return {"success": True, "message": f"Leave has been {action}"}
+        decided, errors = self.repo.decide_leaves(leave_ids, action, reason, self._leave_action_check(admin_role, admin_code, action),
+                                                   self._leave_days)
+        return {
+            "success": True,
+            "message": f"{len(decided)} leave request(s) {action.lower()}",
+            "processed": [r['id'] for r in decided],
+            "failed": [{"id": i, "error": e} for i, e in errors.items()]
+        }
 
-    def get_monthly_summary(self, year: int, month: int):
-        employees = self.repo.get_all_active_employees_basic()
-        
+    def _month_day_kinds(self, employees: List[Dict[str, Any]], year: int, month: int) -> np.ndarray:
+        """(employees x days) calendar day kinds, one calendar per distinct location."""
+        first_day = date(year, month, 1)
+        num_days = calendar.monthrange(year, month)[1]
+        locations: Dict[str, int] = {}
+        index = np.fromiter((locations.setdefault(normalize_location(e.get('location')), len(locations)) for e in employees),
+                            dtype=np.int64, count=len(employees))
+        if not locations:
+            return self.calendar.get_calendar().day_kinds(first_day, num_days)
+        table = np.stack([self.calendar.get_calendar(loc).day_kinds(first_day, num_days) for loc in locations])
+        return table[index]
+
+    def _monthly_status(self, year: int, month: int):
         num_days = calendar.monthrange(year, month)[1]
         start_date = f"{year}-{month:02d}-01"
         end_date = f"{year}-{month:02d}-{num_days}"
-        
-        attendance_rows = self.repo.get_monthly_attendance(start_date, end_date)
-        leave_rows = self.repo.get_monthly_approved_leaves(start_date, end_date)
-        
-        # Process maps
-        att_map = {}
-        for row in attendance_rows:
-            if row['employee_code'] not in att_map: att_map[row['employee_code']] = {}
-            att_map[row['employee_code']][row['date']] = 'Present'
-
-        leave_map = {}
-        for row in leave_rows:
-            code = row['employee_code']
-            if code not in leave_map: leave_map[code] = {}
-            
-            try:
-                d1 = datetime.strptime(row['start_date'], '%Y-%m-%d')
-                d2 = datetime.strptime(row['end_date'], '%Y-%m-%d')
-                
-                month_start = datetime(year, month, 1)
-                month_end = datetime(year, month, num_days)
-                
-                curr = max(d1, month_start)
-                end = min(d2, month_end)
-                
-                while curr <= end:
-                    d_str = curr.strftime('%Y-%m-%d')
-                    leave_map[code][d_str] = 'Leave'
-                    curr += timedelta(days=1)
-            except:
-                pass
-
-        summary = []
-        for emp in employees:
-            code = emp['employee_code']
-            days = []
-            present_count = 0
-            leave_count = 0
-            absent_count = 0
-            
-            for day in range(1, num_days + 1):
-                date_str = f"{year}-{month:02d}-{day:02d}"
-                status = 'Absent'
-                
-                if code in att_map and date_str in att_map[code]:
-                    status = 'Present'
-                    present_count += 1
-                elif code in leave_map and date_str in leave_map[code]:
-                    status = 'Leave'
-                    leave_count += 1
-                else:
-                    try:
-                        dt = datetime(year, month, day)
-                        dt_date = dt.date()
-                        today_date = datetime.now().date()
-                        
-                        if dt.weekday() >= 5: 
-                            status = 'Weekend'
-                        elif dt_date > today_date:
-                            status = 'Future'
-                        elif dt_date == today_date:
-                            status = 'Pending' # Today, but not clocked in yet
-                        else:
-                            status = 'Absent'
-                            absent_count += 1
-                    except:
-                        pass
-                
-                days.append({"day": day, "status": status, "date": date_str})
-
-            summary.append({
-                "name": emp['name'],
-                "code": code,
-                "days": days,
-                "stats": {"present": present_count, "leave": leave_count, "absent": absent_count}
-            })
-            
-        return summary
+
+        employees = self.repo.get_all_active_employees_basic()
+        day_kinds = self._month_day_kinds(employees, year, month)
+        if ATTENDANCE_SUMMARY_SOURCE == "raw":
+            attendance_rows = self.repo.get_monthly_attendance(start_date, end_date)
+            leave_rows = self.repo.get_monthly_approved_leaves(start_date, end_date)
+            return employees, monthly_status_matrix(employees, attendance_rows, leave_rows, year, month, day_kinds=day_kinds)
+        daily_rows = self.repo.get_daily_statuses(start_date, end_date)
+        return employees, rollup_status_matrix(employees, daily_rows, year, month, day_kinds=day_kinds)
+
+    def get_monthly_summary(self, year: int, month: int):
+        employees, status = self._monthly_status(year, month)
+        return list(_full_rows(employees, status, year, month))
+
+    def stream_monthly_summary(self, year: int, month: int, compact: bool = False) -> Iterator[str]:
+        # Queries and the status matrix run up front so errors surface before
+        # the response starts; only serialization is deferred.
+        employees, status = self._monthly_status(year, month)
+        return iter_monthly_summary_json(employees, status, year, month, compact)
+
+    def close_day(self, day: date) -> int:
+        """Finalize `day`: active employees with no clock-in or leave become Absent,
+        or Weekend/Holiday according to their location's calendar."""
+        def status_at(location: str) -> str:
+            return STATUS_LABELS[DAY_KIND_STATUS[self.calendar.get_calendar(location).day_kind(day)]]
+
+        default = status_at('')
+        overrides = {}
+        for location in self.repo.get_active_locations():
+            status = status_at(location) if location else default
+            if status != default:
+                overrides[location] = status
+        return self.repo.close_day(day.isoformat(), default, overrides)
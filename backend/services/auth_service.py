@@ -2,39 +2,38 @@ import secrets
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from backend.repositories.user_repo import UserRepository
-from passlib.hash import pbkdf2_sha256
-
-# In-memory session store (Ideally in a real app, this should be Redis or DB Table)
-# Since we are refactoring, we can keep it here but expose methods to manage it.
-# Or better, move it to the service class.
-ACTIVE_SESSIONS: Dict[str, Any] = {}
+from backend.core.session_store import get_session_store
+from backend.core.password_hasher import get_password_hasher
+from starlette.concurrency import run_in_threadpool
 
 class AuthService:
     def __init__(self):
         self.repo = UserRepository()
+        self.sessions = get_session_store()
+        self.hasher = get_password_hasher()
 
     def get_password_hash(self, password: str) -> str:
-        return pbkdf2_sha256.hash(password)
+        return self.hasher.hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pbkdf2_sha256.verify(plain_password, hashed_password)
+        return self.hasher.verify(plain_password, hashed_password)
 
     def create_session_token(self) -> str:
         return secrets.token_urlsafe(32)
 
-    def login(self, username: str, password: str) -> Optional[dict]:
+    def _login_user(self, username: str) -> Optional[dict]:
         user = self.repo.get_user_by_username(username)
-        if not user:
-            return None
-        
-        if not user['is_active']:
+        if user and not user['is_active']:
             raise ValueError("Account is deactivated")
-        
-        if not self.verify_password(password, user['password_hash']):
-            return None
-        
+        return user
+
+    def _start_session(self, user: dict, new_hash: Optional[str]) -> dict:
+        # The stored hash used an outdated work factor; swap it while we have the password.
+        if new_hash:
+            self.repo.update_password(user['username'], new_hash)
+
         # Success - Update Last Login
-        self.repo.update_last_login(username)
+        self.repo.update_last_login(user['username'])
         
         # Create Session
         token = self.create_session_token()
@@ -47,27 +46,37 @@ class AuthService:
             "employee_code": user['employee_code']
         }
         
-        ACTIVE_SESSIONS[token] = {
-            "user": user_info,
-            "expires_at": expires
-        }
+        self.sessions.create(token, user_info, expires)
         
         return {"token": token, "user": user_info, "expires": expires}
 
+    def login(self, username: str, password: str) -> Optional[dict]:
+        user = self._login_user(username)
+        if not user:
+            return None
+        valid, new_hash = self.hasher.verify_and_update(password, user['password_hash'])
+        if not valid:
+            return None
+        return self._start_session(user, new_hash)
+
+    async def login_async(self, username: str, password: str) -> Optional[dict]:
+        """login() for async endpoints: DB work on the threadpool, hashing on the
+        hasher's process pool, so no request thread waits on PBKDF2."""
+        user = await run_in_threadpool(self._login_user, username)
+        if not user:
+            return None
+        valid, new_hash = await self.hasher.verify_and_update_async(password, user['password_hash'])
+        if not valid:
+            return None
+        return await run_in_threadpool(self._start_session, user, new_hash)
+
     def logout(self, token: str):
-        if token in ACTIVE_SESSIONS:
-            del ACTIVE_SESSIONS[token]
+        self.sessions.delete(token)
 
     def get_session_user(self, token: str) -> Optional[dict]:
-        if not token or token not in ACTIVE_SESSIONS:
+        if not token:
             return None
-            
-        session = ACTIVE_SESSIONS[token]
-        if datetime.now() > session['expires_at']:
-            del ACTIVE_SESSIONS[token]
-            return None
-            
-        return session['user']
+        return self.sessions.get(token)
 
     def create_user(self, username: str, password: str, role: str, employee_code: str = None) -> dict:
         existing = self.repo.get_user_by_username(username)
@@ -0,0 +1,128 @@
+import os
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Union
+import numpy as np
+from backend.repositories.calendar_repo import CalendarRepository
+from backend.core.cache import TTLCache, register_cache
+from backend.core.events import subscribe, HOLIDAYS_CHANGED
+
+# Days covered by the precomputed calendars; dates outside raise ValueError.
+CALENDAR_FIRST_YEAR = int(os.environ.get("CALENDAR_FIRST_YEAR", "2000"))
+CALENDAR_LAST_YEAR = int(os.environ.get("CALENDAR_LAST_YEAR", "2100"))
+# Weekly days off, Monday = 0.
+WEEKEND_DAYS = tuple(int(d) for d in os.environ.get("WEEKEND_DAYS", "5,6").split(","))
+# Holiday edits clear this process's calendars; the TTL covers other workers.
+CALENDAR_CACHE_TTL = float(os.environ.get("CALENDAR_CACHE_TTL", "300"))
+
+WORKING, WEEKEND, HOLIDAY = range(3)
+
+DateLike = Union[date, str]
+
+def _as_date(value: DateLike) -> date:
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+def normalize_location(location: Optional[str]) -> str:
+    return (location or '').strip()
+
+class WorkCalendar:
+    """Day kinds for a fixed span of years plus a running count of working days.
+
+    Any working-day count between two dates is two lookups into `prefix`
+    instead of a walk over the days in between.
+    """
+
+    def __init__(self, holidays: Iterable[DateLike] = (), first_year: int = CALENDAR_FIRST_YEAR,
+                 last_year: int = CALENDAR_LAST_YEAR, weekend_days: Iterable[int] = WEEKEND_DAYS):
+        self.origin = date(first_year, 1, 1)
+        self.last = date(last_year, 12, 31)
+        size = (self.last - self.origin).days + 1
+        weekday = (np.arange(size) + self.origin.weekday()) % 7
+        kinds = np.where(np.isin(weekday, list(weekend_days)), WEEKEND, WORKING).astype(np.int8)
+        offsets = [(d - self.origin).days for d in map(_as_date, holidays) if self.origin <= d <= self.last]
+        if offsets:
+            # A holiday on a day off changes nothing.
+            idx = np.array(offsets, dtype=np.int64)
+            kinds[idx[kinds[idx] == WORKING]] = HOLIDAY
+        self.kinds = kinds
+        self.prefix = np.concatenate(([0], np.cumsum(kinds == WORKING, dtype=np.int32)))
+
+    def _offset(self, day: DateLike) -> int:
+        d = _as_date(day)
+        if not self.origin <= d <= self.last:
+            raise ValueError(f"{d} is outside the working calendar ({self.origin.year}-{self.last.year})")
+        return (d - self.origin).days
+
+    def working_days(self, start: DateLike, end: DateLike) -> int:
+        """Working days in [start, end]; 0 when end is before start."""
+        first, last = self._offset(start), self._offset(end)
+        if last < first:
+            return 0
+        return int(self.prefix[last + 1] - self.prefix[first])
+
+    def day_kind(self, day: DateLike) -> int:
+        return int(self.kinds[self._offset(day)])
+
+    def is_working_day(self, day: DateLike) -> bool:
+        return self.day_kind(day) == WORKING
+
+    def day_kinds(self, start: DateLike, num_days: int) -> np.ndarray:
+        first = self._offset(start)
+        if first + num_days > len(self.kinds):
+            raise ValueError(f"Range runs past the working calendar ({self.last.year})")
+        return self.kinds[first:first + num_days]
+
+_calendars = register_cache("work_calendars", TTLCache(maxsize=256, ttl=CALENDAR_CACHE_TTL))
+
+def invalidate_calendars(**_):
+    _calendars.clear()
+
+subscribe(HOLIDAYS_CHANGED, invalidate_calendars)
+
+class CalendarService:
+    def __init__(self):
+        self.repo = CalendarRepository()
+
+    def _holidays_by_location(self) -> Dict[str, List[str]]:
+        by_location = _calendars.get("holidays")
+        if by_location is None:
+            by_location = defaultdict(list)
+            for h in self.repo.get_holidays():
+                by_location[h['location']].append(h['date'])
+            _calendars.set("holidays", by_location)
+        return by_location
+
+    def get_calendar(self, location: Optional[str] = None) -> WorkCalendar:
+        """Calendar for a location: weekends plus company-wide and local holidays."""
+        location = normalize_location(location)
+        key = ("calendar", location)
+        cal = _calendars.get(key)
+        if cal is None:
+            by_location = self._holidays_by_location()
+            holidays = by_location.get('', []) + (by_location.get(location, []) if location else [])
+            cal = WorkCalendar(holidays)
+            _calendars.set(key, cal)
+        return cal
+
+    def working_days(self, start: DateLike, end: DateLike, location: Optional[str] = None) -> int:
+        return self.get_calendar(location).working_days(start, end)
+
+    def list_holidays(self, year: Optional[int] = None, location: Optional[str] = None):
+        return self.repo.get_holidays(year, normalize_location(location) if location is not None else None)
+
+    def add_holiday(self, day: str, name: str, location: Optional[str] = None):
+        try:
+            day = _as_date(day).isoformat()
+        except ValueError:
+            raise ValueError("Invalid date, expected YYYY-MM-DD")
+        if not name or not name.strip():
+            raise ValueError("Holiday name is required")
+        self.repo.upsert_holiday(day, name.strip(), normalize_location(location))
+        return {"success": True, "message": f"Holiday {name.strip()} saved for {day}"}
+
+    def remove_holiday(self, day: str, location: Optional[str] = None):
+        if not self.repo.delete_holiday(day, normalize_location(location)):
+            raise ValueError("Holiday not found")
+        return {"success": True, "message": "Holiday removed"}
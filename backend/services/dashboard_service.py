@@ -1,12 +1,192 @@
-from typing import Dict, Any
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import date, datetime
+from typing import Dict, Any, List, Tuple
+import numpy as np
 import pandas as pd
+from fastapi.encoders import jsonable_encoder
 from backend.repositories.dashboard_repo import DashboardRepository
+from backend.core.cache import TTLCache, register_cache
+from backend.core.events import (
+    subscribe, EMPLOYEES_CHANGED, ASSETS_CHANGED, SKILLS_CHANGED, ATTENDANCE_CHANGED,
+    LEAVES_CHANGED, TRAINING_CHANGED
+)
+
+# "materialized" (trigger-maintained counters), "sql" (live GROUP BY queries)
+# or "pandas" (full scan). Each source falls back to the next one on error.
+DASHBOARD_STATS_SOURCE = os.environ.get("DASHBOARD_STATS_SOURCE", "materialized")
+
+# Admin stats only change on employee/asset/skill writes (which clear the cache
+# in this process); the TTL bounds staleness from writes on other workers and
+# the date-relative tenure figures.
+DASHBOARD_CACHE_TTL = float(os.environ.get("DASHBOARD_CACHE_TTL", "300"))
+
+_admin_stats_cache = register_cache("admin_dashboard", TTLCache(maxsize=1, ttl=DASHBOARD_CACHE_TTL))
+
+def invalidate_admin_stats(**_):
+    _admin_stats_cache.clear()
+
+for _topic in (EMPLOYEES_CHANGED, ASSETS_CHANGED, SKILLS_CHANGED):
+    subscribe(_topic, invalidate_admin_stats)
+
+# Per-employee home page. Writes for an employee drop just their entry; the
+# short TTL covers other workers, the day rolling over (attendance status) and
+# notifications, which the API never writes itself.
+EMPLOYEE_DASHBOARD_CACHE_TTL = float(os.environ.get("EMPLOYEE_DASHBOARD_CACHE_TTL", "30"))
+EMPLOYEE_DASHBOARD_CACHE_SIZE = int(os.environ.get("EMPLOYEE_DASHBOARD_CACHE_SIZE", "5000"))
+
+_employee_stats_cache = register_cache(
+    "employee_dashboard", TTLCache(maxsize=EMPLOYEE_DASHBOARD_CACHE_SIZE, ttl=EMPLOYEE_DASHBOARD_CACHE_TTL))
+
+def invalidate_employee_stats(employee_code: str = None, **_):
+    if employee_code is None:
+        _employee_stats_cache.clear()
+    else:
+        _employee_stats_cache.delete(employee_code)
+
+for _topic in (ATTENDANCE_CHANGED, LEAVES_CHANGED, TRAINING_CHANGED, EMPLOYEES_CHANGED, ASSETS_CHANGED):
+    subscribe(_topic, invalidate_employee_stats)
+
+EXPERIENCE_LABELS = ['0-2', '3-5', '6-10', '11-15', '16+']
+TENURE_BINS = [(1, '0-1y'), (2, '1-2y'), (5, '2-5y'), (100, '5y+')]
+
+def _distribution(counts: Dict[str, int], limit: int = None) -> List[Dict[str, Any]]:
+    items = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)
+    if limit:
+        items = items[:limit]
+    return [{"name": k, "value": v} for k, v in items]
+
+def asset_status_counts(df_assets: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Laptop status per asset row (Returned wins over Assigned), counted."""
+    if df_assets.empty:
+        return []
+    zeros = pd.Series(0, index=df_assets.index)
+    status = np.select(
+        [df_assets.get('cl_laptop', zeros).eq(1), df_assets.get('ob_laptop', zeros).eq(1)],
+        ["Returned", "Assigned"],
+        default="None"
+    )
+    counts = pd.Series(status[status != "None"]).value_counts().reset_index()
+    counts.columns = ['name', 'value']
+    return counts.to_dict('records')
+
+def top_skill_counts(df_skills: pd.DataFrame, n: int = 7) -> List[Dict[str, Any]]:
+    """Most common entries across the comma separated primary_skillset strings."""
+    if df_skills.empty or 'primary_skillset' not in df_skills.columns:
+        return []
+    raw = df_skills['primary_skillset'].dropna()
+    raw = raw[raw != '']
+    if raw.empty:
+        return []
+    # One C-level split over the joined column, then tally codes and strip
+    # only the (few) distinct tokens instead of every occurrence.
+    parts = pd.Series(",".join(raw.astype(str).tolist()).split(","))
+    codes, uniques = pd.factorize(parts)
+    tally = pd.Series(np.bincount(codes, minlength=len(uniques)), index=pd.Index(uniques).str.strip())
+    tally = tally.groupby(level=0).sum().sort_values(ascending=False, kind='stable').head(n)
+    return [{"name": k, "value": int(v)} for k, v in tally.items()]
+
+def recent_hires_from_frame(df_emp: pd.DataFrame, n: int = 5) -> List[Dict[str, Any]]:
+    """Latest n joiners by doj; rows whose doj doesn't parse are left out."""
+    if df_emp.empty or 'doj' not in df_emp.columns:
+        return []
+    recent_df = df_emp.assign(doj=pd.to_datetime(df_emp['doj'], errors='coerce')).dropna(subset=['doj'])
+    recent_df = recent_df.sort_values(by='doj', ascending=False).head(n)
+    recent_df['doj_str'] = recent_df['doj'].dt.strftime('%Y-%m-%d')
+    return recent_df[['name', 'team', 'designation', 'doj_str', 'location']].to_dict('records')
 
 class DashboardService:
     def __init__(self):
         self.repo = DashboardRepository()
 
-    def get_admin_stats(self) -> Dict[str, Any]:
+    def get_cached_admin_stats(self) -> Tuple[Dict[str, Any], str]:
+        """Admin stats plus an ETag for them, served from the TTL cache when fresh."""
+        cached = _admin_stats_cache.get("admin")
+        if cached is not None:
+            return cached
+
+        payload = jsonable_encoder(self.get_admin_stats())
+        digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+        result = (payload, f'"{digest}"')
+        _admin_stats_cache.set("admin", result)
+        return result
+
+    def get_admin_stats(self, source: str = DASHBOARD_STATS_SOURCE) -> Dict[str, Any]:
+        if source == "materialized":
+            try:
+                stats = self.repo.get_materialized_stats()
+                return self.build_admin_stats(stats, self.repo.get_recent_hires(5))
+            except sqlite3.OperationalError as e:
+                # dashboard_stats not migrated yet
+                print(f"Materialized dashboard stats unavailable, using SQL aggregates: {e}")
+                source = "sql"
+
+        if source == "sql":
+            try:
+                stats = self.repo.get_aggregated_stats()
+                return self.build_admin_stats(stats, self.repo.get_recent_hires(5))
+            except sqlite3.OperationalError as e:
+                print(f"SQL dashboard aggregation failed, using pandas: {e}")
+
+        return self.compute_admin_stats_from_tables()
+
+    def build_admin_stats(self, stats: Dict[str, Dict[str, int]], recent_hires: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Assemble the admin payload from {dimension: {bucket: count}} counters."""
+        status = stats.get('status', {})
+
+        hiring_trend = [
+            {"Year": int(y), "Hires": v}
+            for y, v in sorted(stats.get('hire_year', {}).items(), key=lambda kv: int(kv[0]))
+        ]
+
+        experience = stats.get('experience', {})
+        experience_distribution = [{"range": l, "count": experience.get(l, 0)} for l in EXPERIENCE_LABELS]
+
+        # Tenure is time dependent, so it's derived from the per-date histogram of active joiners.
+        today = date.today()
+        tenure_counts = {label: 0 for _, label in TENURE_BINS}
+        total_days = 0
+        active_with_doj = 0
+        for doj_str, count in stats.get('active_doj', {}).items():
+            try:
+                days = (today - datetime.strptime(doj_str, '%Y-%m-%d').date()).days
+            except ValueError:
+                continue
+            total_days += days * count
+            active_with_doj += count
+            years = days / 365
+            for upper, label in TENURE_BINS:
+                if 0 < years <= upper:
+                    tenure_counts[label] += count
+                    break
+        avg_tenure = round(total_days / active_with_doj / 365, 1) if active_with_doj else 0
+        tenure_distribution = [{"range": label, "count": tenure_counts[label]} for _, label in TENURE_BINS] if active_with_doj else []
+
+        return {
+            "counts": {
+                "total": stats.get('employees', {}).get('total', 0),
+                "active": status.get('Active', 0),
+                "exited": status.get('Exited', 0),
+                "teams": len(stats.get('team', {})),
+                "designations": len(stats.get('designation', {})),
+                "avg_tenure": avg_tenure
+            },
+            "charts": {
+                "department": _distribution(stats.get('team', {})),
+                "status": _distribution(status),
+                "hiring_trend": hiring_trend,
+                "assets": _distribution(stats.get('asset_status', {})),
+                "skills": _distribution(stats.get('skill', {}), limit=7),
+                "experience": experience_distribution,
+                "tenure": tenure_distribution,
+                "location": _distribution(stats.get('location', {}))
+            },
+            "recent_hires": recent_hires
+        }
+
+    def compute_admin_stats_from_tables(self) -> Dict[str, Any]:
         data = self.repo.get_all_counts()
         df_emp = data['employees']
         df_assets = data['assets']
@@ -40,33 +220,10 @@ class DashboardService:
         hiring_trend = hiring_trend_df.to_dict('records')
 
         # 5. Asset Inventory
-        def get_asset_status(row):
-            if row.get('cl_laptop', 0) == 1:
-                return "Returned"
-            elif row.get('ob_laptop', 0) == 1:
-                return "Assigned"
-            else:
-                return "None"
-
-        if not df_assets.empty:
-            df_assets['status'] = df_assets.apply(get_asset_status, axis=1)
-            asset_counts = df_assets[df_assets['status'] != 'None']['status'].value_counts().reset_index()
-            asset_counts.columns = ['name', 'value']
-            asset_distribution = asset_counts.to_dict('records')
-        else:
-            asset_distribution = []
+        asset_distribution = asset_status_counts(df_assets)
 
         # 6. Top Skills
-        all_skills = []
-        if not df_skills.empty and 'primary_skillset' in df_skills.columns:
-            for skills_str in df_skills['primary_skillset'].dropna():
-                if skills_str:
-                    parts = [s.strip() for s in skills_str.split(',')]
-                    all_skills.extend(parts)
-        
-        skill_counts = pd.Series(all_skills).value_counts().head(7).reset_index()
-        skill_counts.columns = ['name', 'value']
-        top_skills = skill_counts.to_dict('records')
+        top_skills = top_skill_counts(df_skills)
 
         # 7. Experience Distribution
         experience_distribution = []
@@ -105,12 +262,7 @@ class DashboardService:
             location_distribution = loc_counts.to_dict('records')
 
         # 10. Recent Hires
-        recent_hires = []
-        if 'doj' in df_emp.columns:
-            recent_df = df_emp.sort_values(by='doj', ascending=False).head(5)
-            # Fix: .dt accessors inside lambda or safely
-            recent_df['doj_str'] = recent_df['doj'].dt.strftime('%Y-%m-%d')
-            recent_hires = recent_df[['name', 'team', 'designation', 'doj_str', 'location']].to_dict('records')
+        recent_hires = recent_hires_from_frame(df_emp)
 
         return {
             "counts": {
@@ -135,7 +287,14 @@ class DashboardService:
         }
 
     def get_employee_stats(self, employee_code: str) -> Dict[str, Any]:
-        data = self.repo.get_employee_dashboard_data(employee_code)
+        cached = _employee_stats_cache.get(employee_code)
+        if cached is not None:
+            return cached
+        stats = self.build_employee_stats(self.repo.get_employee_dashboard_data(employee_code))
+        _employee_stats_cache.set(employee_code, stats)
+        return stats
+
+    def build_employee_stats(self, data: Dict[str, Any]) -> Dict[str, Any]:
         
         # Safely extract
         emp = data['employee'] 
@@ -1,40 +1,73 @@
+import base64
+import json
 from datetime import datetime
 import os
+import re
 import shutil
 from typing import Optional, Dict, Any, List
-from backend.repositories.employee_repo import EmployeeRepository
+from backend.repositories.employee_repo import EmployeeRepository, DIRECTORY_SORT_KEYS
 from backend.schemas.employee import UpdateEmployeeRequest, OffboardRequest
 
+DIRECTORY_DEFAULT_LIMIT = 50
+DIRECTORY_MAX_LIMIT = 200
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+def encode_cursor(sort_key: Any, employee_code: str) -> str:
+    raw = json.dumps([sort_key, employee_code], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_key, employee_code = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return sort_key, employee_code
+
 class EmployeeService:
     def __init__(self):
         self.repo = EmployeeRepository()
 
-    def get_all_employees(self):
-        return self.repo.get_all_employees_basic()
+    def list_employees(self, filters: Dict[str, Any], sort: str = "name", order: str = "asc",
+                       limit: Optional[int] = None, cursor: Optional[str] = None):
+        """Filtered, sorted directory. Without limit/cursor the full list is returned
+        as before; with either, a page plus a `next_cursor` (None on the last page)."""
+        if sort not in DIRECTORY_SORT_KEYS:
+            raise ValueError(f"Unsupported sort field: {sort}")
+        if order not in ("asc", "desc"):
+            raise ValueError("Order must be 'asc' or 'desc'")
+        descending = order == "desc"
+
+        if limit is None and cursor is None:
+            rows = self.repo.get_employees_page(filters, sort, descending)
+            for row in rows:
+                row.pop('sort_key')
+            return rows
+
+        limit = min(limit or DIRECTORY_DEFAULT_LIMIT, DIRECTORY_MAX_LIMIT)
+        after = decode_cursor(cursor) if cursor else None
+        # One extra row tells us whether another page exists.
+        rows = self.repo.get_employees_page(filters, sort, descending, limit + 1, after)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['sort_key'], rows[-1]['employee_code']) if has_more else None
+        for row in rows:
+            row.pop('sort_key')
+        return {"items": rows, "next_cursor": next_cursor}
+
+    def search_employees(self, q: str, limit: Optional[int] = None):
+        # Every word must match, each as a prefix ("pyt dev" finds "Python Developer").
+        # Words are quoted so FTS5 operators in user input are treated as text.
+        terms = re.findall(r"\w+", q or "")
+        if not terms:
+            return []
+        match = " ".join(f'"{t}"*' for t in terms)
+        limit = min(limit or SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT)
+        return self.repo.search_employees(match, limit)
 
     def get_employee_full_details(self, employee_code: str):
-        employee = self.repo.get_employee_by_code(employee_code)
-        if not employee:
-            return None
-            
-        # Enrich with other data
-        employee['skill_matrix'] = self.repo.get_skill_matrix(employee_code)
-        employee['assets'] = self.repo.get_assets(employee_code)
-        employee['training'] = self.repo.get_hr_activity(employee_code)
-        
-        # New: Quarterly Assessments
-        assessments = self.repo.get_assessments(employee_code)
-        employee['assessments'] = assessments
-        
-        # Calculate Average Score (optional logic for dashboard usage)
-        if assessments:
-             total = sum([a['total_score'] for a in assessments if a['status'] == 'Finalized'])
-             count = len([a for a in assessments if a['status'] == 'Finalized'])
-             employee['average_score'] = round(total / count, 1) if count > 0 else 0
-        else:
-             employee['average_score'] = 0
-
-        return employee
+        return self.repo.get_employee_full_profile(employee_code)
 
     def create_employee(self, data: Dict[str, Any]):
         # Validations
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from backend.repositories.onboarding_repo import OnboardingRepository
-from passlib.hash import pbkdf2_sha256
+from backend.core.password_hasher import get_password_hasher
 
 class OnboardingService:
     def __init__(self):
@@ -93,7 +93,7 @@ class OnboardingService:
             emp_code = f"EMP{str(random.randint(1000, 9999))}"
 
         # 2. Prepare Data
-        password_hash = pbkdf2_sha256.hash(password)
+        password_hash = get_password_hasher().hash(password)
         
         user_data = {
             "email": invite['email'],
@@ -0,0 +1,58 @@
+"""Nightly close-of-day job for the attendance_daily rollup.
+
+Marks every active employee with no clock-in or approved leave on the day as
+Absent, or Weekend/Holiday per their location's working calendar. Safe to
+re-run; it only fills gaps.
+
+    python -m backend.tasks.close_of_day                # yesterday
+    python -m backend.tasks.close_of_day --date 2024-05-31
+    python -m backend.tasks.close_of_day --since 2024-01-01
+"""
+import argparse
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+# Ensure backend package is in path (Project Root)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.services.attendance_service import AttendanceService
+
+
+def close_days(start: date, end: date) -> int:
+    service = AttendanceService()
+    total = 0
+    day = start
+    while day <= end:
+        total += service.close_day(day)
+        day += timedelta(days=1)
+    return total
+
+
+def close_yesterday() -> int:
+    yesterday = date.today() - timedelta(days=1)
+    return close_days(yesterday, yesterday)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.tasks.close_of_day", description=__doc__.splitlines()[0])
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--date", help="Close a single day (YYYY-MM-DD)")
+    group.add_argument("--since", help="Close every day from this date through yesterday (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    yesterday = date.today() - timedelta(days=1)
+    if args.date:
+        start = end = datetime.strptime(args.date, "%Y-%m-%d").date()
+    elif args.since:
+        start, end = datetime.strptime(args.since, "%Y-%m-%d").date(), yesterday
+    else:
+        start = end = yesterday
+
+    rows = close_days(start, end)
+    print(f"Closed {start} to {end}: {rows} row(s) recorded.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Yearly leave rollover for leave_balances.
+
+Opens a balance row for every active employee for the year: fresh sick and
+casual entitlement, plus unused privilege days from the previous year up to
+LEAVE_CARRY_FORWARD_MAX. Safe to re-run; existing rows keep their used
+counts and only have their carry-forward recomputed.
+
+    python -m backend.tasks.leave_rollover               # current year
+    python -m backend.tasks.leave_rollover --year 2025
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+# Ensure backend package is in path (Project Root)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.services.attendance_service import AttendanceService
+
+
+def roll_over(year: int) -> int:
+    return AttendanceService().open_leave_year(year)
+
+
+def roll_over_current_year() -> int:
+    return roll_over(date.today().year)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.tasks.leave_rollover", description=__doc__.splitlines()[0])
+    parser.add_argument("--year", type=int, default=date.today().year, help="Leave year to open (default: current)")
+    args = parser.parse_args(argv)
+
+    rows = roll_over(args.year)
+    print(f"Opened leave year {args.year}: {rows} balance row(s) written.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
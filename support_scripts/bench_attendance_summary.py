@@ -0,0 +1,128 @@
+"""Benchmark the admin monthly attendance summary.
+
+Compares the previous per-day loop with the NumPy status-matrix builder in
+AttendanceService on synthetic employees, attendance and approved leaves.
+
+    python support_scripts/bench_attendance_summary.py [--sizes 1000 10000] [--repeat 3]
+"""
+import argparse
+import calendar
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+# Ensure backend package is in path (Project Root)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services.attendance_service import build_monthly_summary
+
+
+# --- Previous implementation, kept here for comparison ---
+
+def legacy_monthly_summary(employees, attendance_rows, leave_rows, year, month, today):
+    num_days = calendar.monthrange(year, month)[1]
+
+    att_map = {}
+    for row in attendance_rows:
+        if row['employee_code'] not in att_map: att_map[row['employee_code']] = {}
+        att_map[row['employee_code']][row['date']] = 'Present'
+
+    leave_map = {}
+    for row in leave_rows:
+        code = row['employee_code']
+        if code not in leave_map: leave_map[code] = {}
+        try:
+            d1 = datetime.strptime(row['start_date'], '%Y-%m-%d')
+            d2 = datetime.strptime(row['end_date'], '%Y-%m-%d')
+            curr = max(d1, datetime(year, month, 1))
+            end = min(d2, datetime(year, month, num_days))
+            while curr <= end:
+                leave_map[code][curr.strftime('%Y-%m-%d')] = 'Leave'
+                curr += timedelta(days=1)
+        except:
+            pass
+
+    summary = []
+    for emp in employees:
+        code = emp['employee_code']
+        days = []
+        present_count = leave_count = absent_count = 0
+        for day in range(1, num_days + 1):
+            date_str = f"{year}-{month:02d}-{day:02d}"
+            if code in att_map and date_str in att_map[code]:
+                status = 'Present'
+                present_count += 1
+            elif code in leave_map and date_str in leave_map[code]:
+                status = 'Leave'
+                leave_count += 1
+            else:
+                dt = datetime(year, month, day)
+                if dt.weekday() >= 5:
+                    status = 'Weekend'
+                elif dt.date() > today:
+                    status = 'Future'
+                elif dt.date() == today:
+                    status = 'Pending'
+                else:
+                    status = 'Absent'
+                    absent_count += 1
+            days.append({"day": day, "status": status, "date": date_str})
+        summary.append({
+            "name": emp['name'],
+            "code": code,
+            "days": days,
+            "stats": {"present": present_count, "leave": leave_count, "absent": absent_count}
+        })
+    return summary
+
+
+def make_data(n, year, month, seed=42):
+    rng = random.Random(seed)
+    num_days = calendar.monthrange(year, month)[1]
+    employees = [{"name": f"Employee {i}", "employee_code": f"EMP{i:05d}"} for i in range(n)]
+    attendance, leaves = [], []
+    for emp in employees:
+        for day in range(1, num_days + 1):
+            if date(year, month, day).weekday() < 5 and rng.random() < 0.85:
+                attendance.append({"employee_code": emp['employee_code'], "date": f"{year}-{month:02d}-{day:02d}"})
+        if rng.random() < 0.2:
+            start = date(year, month, 1) + timedelta(days=rng.randint(-5, num_days - 1))
+            leaves.append({"employee_code": emp['employee_code'], "start_date": start.isoformat(),
+                           "end_date": (start + timedelta(days=rng.randint(0, 7))).isoformat(), "leave_type": "Casual"})
+    return employees, attendance, leaves
+
+
+def best_of(fn, repeat, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--year", type=int, default=2024)
+    parser.add_argument("--month", type=int, default=5)
+    args = parser.parse_args()
+
+    # Pin "today" mid-month so Present/Absent/Pending/Future all occur.
+    today = date(args.year, args.month, 15)
+
+    print(f"{'employees':>9} {'legacy ms':>10} {'vector ms':>10} {'speedup':>8}")
+    for n in args.sizes:
+        employees, attendance, leaves = make_data(n, args.year, args.month)
+        old_t, old_r = best_of(legacy_monthly_summary, args.repeat, employees, attendance, leaves, args.year, args.month, today)
+        new_t, new_r = best_of(build_monthly_summary, args.repeat, employees, attendance, leaves, args.year, args.month, today)
+        assert old_r == new_r, "summary mismatch"
+        print(f"{n:>9} {old_t * 1000:>10.1f} {new_t * 1000:>10.1f} {old_t / new_t:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
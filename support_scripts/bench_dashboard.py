@@ -0,0 +1,130 @@
+"""Benchmark the admin dashboard's asset-status and skill-tally sections.
+
+Compares the old per-row implementations with the vectorized helpers in
+DashboardService on synthetic frames, and checks that the SQL and pandas
+recent-hire lists agree on a table that includes malformed join dates.
+
+    python support_scripts/bench_dashboard.py [--sizes 10000 100000] [--repeat 3]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Ensure backend package is in path (Project Root)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.repositories.dashboard_repo import RECENT_HIRES_SQL
+from backend.services.dashboard_service import asset_status_counts, recent_hires_from_frame, top_skill_counts
+
+SKILLS = ["Python", "SQL", "React", "Java", "Go", "AWS", "Docker", "Excel", "Figma", "Kotlin", "Rust", "Sales"]
+
+
+# --- Previous implementations, kept here for comparison ---
+
+def legacy_asset_status_counts(df_assets):
+    def get_asset_status(row):
+        if row.get('cl_laptop', 0) == 1:
+            return "Returned"
+        elif row.get('ob_laptop', 0) == 1:
+            return "Assigned"
+        else:
+            return "None"
+
+    df_assets = df_assets.copy()
+    df_assets['status'] = df_assets.apply(get_asset_status, axis=1)
+    counts = df_assets[df_assets['status'] != 'None']['status'].value_counts().reset_index()
+    counts.columns = ['name', 'value']
+    return counts.to_dict('records')
+
+
+def legacy_top_skill_counts(df_skills):
+    all_skills = []
+    for skills_str in df_skills['primary_skillset'].dropna():
+        if skills_str:
+            parts = [s.strip() for s in skills_str.split(',')]
+            all_skills.extend(parts)
+    counts = pd.Series(all_skills).value_counts().head(7).reset_index()
+    counts.columns = ['name', 'value']
+    return counts.to_dict('records')
+
+
+def make_frames(n, seed=42):
+    rng = np.random.default_rng(seed)
+    df_assets = pd.DataFrame({
+        "ob_laptop": rng.integers(0, 2, n),
+        "cl_laptop": (rng.random(n) < 0.1).astype(int),
+    })
+    picks = rng.integers(0, len(SKILLS), (n, 3))
+    skills = [", ".join(SKILLS[i] for i in row[: 1 + k % 3]) for k, row in enumerate(picks)]
+    skills = [s if k % 20 else None for k, s in enumerate(skills)]
+    df_skills = pd.DataFrame({"primary_skillset": skills})
+    return df_assets, df_skills
+
+
+def make_employees(n, seed=42):
+    """In-memory employees table with distinct join dates plus malformed ones.
+
+    Malformed values like 'TBD' sort above every real date as raw text.
+    """
+    rng = np.random.default_rng(seed)
+    offsets = rng.permutation(n)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE employees (name TEXT, team TEXT, designation TEXT, doj TEXT, location TEXT)")
+    rows = [(f"emp{i}", "Team", "Engineer", (pd.Timestamp("1990-01-01") + pd.Timedelta(days=int(d))).strftime('%Y-%m-%d'),
+             "Pune") for i, d in enumerate(offsets)]
+    rows += [(f"bad{k}", "Team", "Engineer", doj, "Pune") for k, doj in enumerate(["TBD", "2023-13-45", "", None])]
+    conn.executemany("INSERT INTO employees VALUES (?, ?, ?, ?, ?)", rows)
+    return conn
+
+
+def best_of(fn, repeat, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def as_counts(records):
+    return {r['name']: r['value'] for r in records}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'section':<8} {'legacy ms':>10} {'vector ms':>10} {'speedup':>8}")
+    for n in args.sizes:
+        df_assets, df_skills = make_frames(n)
+
+        old_t, old_r = best_of(legacy_asset_status_counts, args.repeat, df_assets)
+        new_t, new_r = best_of(asset_status_counts, args.repeat, df_assets)
+        assert as_counts(old_r) == as_counts(new_r), "asset status mismatch"
+        print(f"{n:>8} {'assets':<8} {old_t * 1000:>10.1f} {new_t * 1000:>10.1f} {old_t / new_t:>7.1f}x")
+
+        old_t, old_r = best_of(legacy_top_skill_counts, args.repeat, df_skills)
+        new_t, new_r = best_of(top_skill_counts, args.repeat, df_skills)
+        assert as_counts(old_r) == as_counts(new_r), "skill tally mismatch"
+        print(f"{n:>8} {'skills':<8} {old_t * 1000:>10.1f} {new_t * 1000:>10.1f} {old_t / new_t:>7.1f}x")
+
+        conn = make_employees(n)
+        df_emp = pd.read_sql("SELECT name, team, designation, doj, location FROM employees", conn)
+        old_t, old_r = best_of(recent_hires_from_frame, args.repeat, df_emp)
+        new_t, new_r = best_of(lambda: [dict(zip(('name', 'team', 'designation', 'doj_str', 'location'), r))
+                                        for r in conn.execute(RECENT_HIRES_SQL, (5,))], args.repeat)
+        conn.close()
+        assert old_r == new_r, f"recent hires mismatch: pandas {old_r} vs sql {new_r}"
+        print(f"{n:>8} {'hires':<8} {old_t * 1000:>10.1f} {new_t * 1000:>10.1f} {old_t / new_t:>7.1f}x  (pandas vs SQL)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Benchmark and check the approved-leave range query used by the attendance summary.
+
+Builds a scratch SQLite database with a large synthetic leaves table and, for a
+set of months, compares:
+
+  * the old BETWEEN/OR query (misses leaves spanning the whole month),
+  * the interval-overlap query with a (status, start_date, end_date) index,
+  * the interval-overlap query with idx_leaves_status_end_start, as shipped.
+
+Every overlap result is checked against a brute-force Python filter and
+against the old query: it must return everything the old one did, plus
+exactly the leaves that span the whole month (the old query's blind spot).
+Any mismatch raises, so the script exits non-zero. `--check` runs just the
+comparison on a small table.
+
+    python support_scripts/bench_leave_overlap.py [--rows 500000] [--repeat 5] [--check]
+"""
+import argparse
+import calendar
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Ensure backend package is in path (Project Root)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.repositories.attendance_repo import APPROVED_LEAVES_OVERLAP_SQL
+
+LEGACY_SQL = """
+    SELECT employee_code, start_date, end_date, leave_type
+    FROM leaves
+    WHERE status = 'Approved'
+    AND (
+        (start_date BETWEEN :start AND :end) OR
+        (end_date BETWEEN :start AND :end)
+    )
+"""
+
+INDEXES = {
+    "start-first": "CREATE INDEX idx_bench ON leaves(status, start_date, end_date)",
+    "end-first": "CREATE INDEX idx_bench ON leaves(status, end_date, start_date)",
+}
+
+
+def build_db(path, rows, seed=7):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE leaves (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_code TEXT, start_date TEXT, end_date TEXT,
+            leave_type TEXT, reason TEXT, status TEXT
+        )
+    """)
+    origin = date(2015, 1, 1)
+    span = (date(2025, 12, 31) - origin).days
+    data = []
+    for i in range(rows):
+        start = origin + timedelta(days=rng.randrange(span))
+        # Mostly short leaves, with the odd sabbatical spanning months.
+        length = rng.randint(0, 4) if rng.random() < 0.98 else rng.randint(30, 120)
+        status = rng.choices(["Approved", "Rejected", "Pending"], [0.8, 0.15, 0.05])[0]
+        data.append((f"EMP{rng.randrange(20000):05d}", start.isoformat(),
+                     (start + timedelta(days=length)).isoformat(), "Casual", "", status))
+    conn.executemany("INSERT INTO leaves (employee_code, start_date, end_date, leave_type, reason, status) "
+                     "VALUES (?, ?, ?, ?, ?, ?)", data)
+    conn.commit()
+    return conn, data
+
+
+def month_bounds(year, month):
+    return f"{year}-{month:02d}-01", f"{year}-{month:02d}-{calendar.monthrange(year, month)[1]:02d}"
+
+
+def brute_force(data, start, end):
+    return sorted((code, s, e) for code, s, e, _, _, status in data
+                  if status == "Approved" and s <= end and e >= start)
+
+
+def check_results(label, start, end, want, legacy, overlap):
+    """Raise (even under python -O) unless the overlap query matches both references."""
+    if overlap != want:
+        missing, extra = sorted(set(want) - set(overlap)), sorted(set(overlap) - set(want))
+        raise AssertionError(f"overlap query wrong for {start}..{end} ({label}): "
+                             f"{len(missing)} missing e.g. {missing[:3]}, {len(extra)} extra e.g. {extra[:3]}")
+    lost = sorted(set(legacy) - set(overlap))
+    if lost:
+        raise AssertionError(f"overlap query drops rows the old query returned for {start}..{end} ({label}): {lost[:3]}")
+    added = set(overlap) - set(legacy)
+    not_spanning = sorted(r for r in added if not (r[1] < start and r[2] > end))
+    if not_spanning:
+        raise AssertionError(f"overlap query differs from the old one beyond month-spanning leaves "
+                             f"for {start}..{end} ({label}): {not_spanning[:3]}")
+
+
+def best_of(conn, sql, params, repeat):
+    best = float("inf")
+    rows = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = conn.execute(sql, params).fetchall()
+        best = min(best, time.perf_counter() - started)
+    return best, sorted((r[0], r[1], r[2]) for r in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Correctness only: small table, one run per query")
+    args = parser.parse_args()
+    if args.check:
+        args.rows, args.repeat = min(args.rows, 50_000), 1
+
+    months = [(2016, 3), (2020, 7), (2025, 11)]
+    with tempfile.TemporaryDirectory() as tmp:
+        conn, data = build_db(os.path.join(tmp, "leaves.db"), args.rows)
+        expected = {m: brute_force(data, *month_bounds(*m)) for m in months}
+
+        print(f"{'month':<8} {'query':<22} {'rows':>6} {'missed':>6} {'ms':>8}")
+        for label, ddl in [("no index", None)] + list(INDEXES.items()):
+            conn.execute("DROP INDEX IF EXISTS idx_bench")
+            if ddl:
+                conn.execute(ddl)
+            conn.execute("ANALYZE")
+            for m in months:
+                start, end = month_bounds(*m)
+                params = {"start": start, "end": end}
+                want = expected[m]
+                legacy_t, legacy = best_of(conn, LEGACY_SQL, params, args.repeat)
+                overlap_t, overlap = best_of(conn, APPROVED_LEAVES_OVERLAP_SQL, params, args.repeat)
+                check_results(label, start, end, want, legacy, overlap)
+                name = f"{m[0]}-{m[1]:02d}"
+                print(f"{name:<8} {'legacy / ' + label:<22} {len(legacy):>6} {len(want) - len(legacy):>6} {legacy_t * 1000:>8.2f}")
+                print(f"{name:<8} {'overlap / ' + label:<22} {len(overlap):>6} {0:>6} {overlap_t * 1000:>8.2f}")
+        conn.close()
+    print(f"OK: overlap query matched brute force and the old query on {len(months)} months x {len(INDEXES) + 1} index setups.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark login password checks under a burst, and their effect on other requests.
+
+Simulates the API's event loop: N concurrent logins verify a PBKDF2 hash while
+a probe repeatedly runs a trivial sync handler on the request threadpool (as
+any other endpoint would). Compares hashing on the threadpool (the previous
+behaviour, PASSWORD_HASH_WORKERS=0) with the PBKDF2 process pool.
+
+    python support_scripts/bench_login.py [--logins 400] [--workers 4] [--rounds 29000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Ensure backend package is in path (Project Root)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.core.password_hasher import HasherBusy, PasswordHasher
+
+
+async def run_burst(hasher, password_hash, logins):
+    probe_latencies = []
+    rejected = 0
+    done = asyncio.Event()
+
+    async def login():
+        nonlocal rejected
+        try:
+            valid, _ = await hasher.verify_and_update_async("correct horse", password_hash)
+            assert valid
+        except HasherBusy:
+            rejected += 1
+
+    async def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            await run_in_threadpool(lambda: None)
+            probe_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0.01)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe_task
+    return elapsed, rejected, probe_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--rounds", type=int, default=29000)
+    parser.add_argument("--queue-depth", type=int, default=None,
+                        help="Backpressure limit for the pool run (default: no 429s)")
+    args = parser.parse_args()
+
+    configs = [
+        ("threadpool", PasswordHasher(rounds=args.rounds, workers=0, queue_depth=args.logins)),
+        (f"{args.workers} procs", PasswordHasher(rounds=args.rounds, workers=args.workers,
+                                                 queue_depth=args.queue_depth or args.logins)),
+    ]
+    password_hash = configs[0][1].hash("correct horse")
+
+    print(f"{'hashing':<12} {'logins/s':>9} {'429s':>6} {'probe p50 ms':>13} {'probe p99 ms':>13}")
+    for label, hasher in configs:
+        if hasher.workers:
+            # Start the worker processes outside the timed run.
+            hasher.verify_and_update("warm up", password_hash)
+        elapsed, rejected, probes = asyncio.run(run_burst(hasher, password_hash, args.logins))
+        hasher.shutdown()
+        probes.sort()
+        p50 = statistics.median(probes) * 1000
+        p99 = probes[min(len(probes) - 1, int(len(probes) * 0.99))] * 1000
+        print(f"{label:<12} {(args.logins - rejected) / elapsed:>9.1f} {rejected:>6} {p50:>13.2f} {p99:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Check that attendance status works while a clock-in is still write-behind queued.
+
+Runs the API against a throwaway database with ATTENDANCE_WRITE_BEHIND=1 and a
+long flush delay, clocks in, and asserts /api/attendance/status reports the
+buffered punch (without an id) before it is written, and with one after.
+
+    python support_scripts/check_punch_status.py
+"""
+import os
+import sys
+import tempfile
+
+# Ensure backend package is in path (Project Root)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Read at import time by the attendance service.
+os.environ["ATTENDANCE_WRITE_BEHIND"] = "1"
+os.environ["ATTENDANCE_FLUSH_MS"] = "60000"
+
+from fastapi.testclient import TestClient
+
+import backend.database as database
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        database._pool = database.ConnectionPool(os.path.join(tmp, "check.db"))
+
+        from backend.main import app
+        from backend.services.auth_service import AuthService
+        from backend.services.attendance_service import get_punch_buffer
+
+        with TestClient(app) as client:
+            AuthService().create_user("punch_check", "pw", "Employee", "CHK001")
+            conn = database.get_db_connection()
+            try:
+                conn.execute("INSERT INTO employees (employee_code, name) VALUES ('CHK001', 'Punch Check')")
+                conn.commit()
+            finally:
+                conn.close()
+
+            resp = client.post("/api/auth/login", json={"username": "punch_check", "password": "pw"})
+            assert resp.status_code == 200, resp.text
+            resp = client.post("/api/attendance/clock-in")
+            assert resp.status_code == 200, resp.text
+
+            buffer = get_punch_buffer()
+            assert len(buffer.queue) == 1, "clock-in was written before the status check"
+            resp = client.get("/api/attendance/status")
+            assert resp.status_code == 200, resp.text
+            body = resp.json()
+            assert body["status"] == "clocked_in" and body["data"]["id"] is None, body
+
+            buffer.flush()
+            body = client.get("/api/attendance/status").json()
+            assert body["status"] == "clocked_in" and body["data"]["id"] is not None, body
+
+        database.close_pool()
+    print("OK: status served a buffered clock-in and the written one")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -521,6 +521,7 @@ function ManagerSection() {
                                                         if (day.status === 'Present') colorClass = 'bg-green-500';
                                                         else if (day.status === 'Leave') colorClass = 'bg-blue-500';
                                                         else if (day.status === 'Weekend') colorClass = 'bg-gray-800';
+                                                        else if (day.status === 'Holiday') colorClass = 'bg-purple-500/60';
                                                         else if (day.status === 'Absent') colorClass = 'bg-red-500/20 border border-red-500/50';
                                                         else if (day.status === 'Pending') colorClass = 'bg-yellow-500/20 border border-yellow-500/50'; // Today
                                                         else if (day.status === 'Future') colorClass = 'bg-gray-800/10 opacity-30';
@@ -551,6 +552,7 @@ function ManagerSection() {
                                 <div className="flex items-center gap-2"><div className="w-3 h-3 rounded-full bg-blue-500"></div> Leave</div>
                                 <div className="flex items-center gap-2"><div className="w-3 h-3 rounded-full bg-red-500/20 border border-red-500/50"></div> Absent</div>
                                 <div className="flex items-center gap-2"><div className="w-3 h-3 rounded-full bg-gray-800"></div> Weekend</div>
+                                <div className="flex items-center gap-2"><div className="w-3 h-3 rounded-full bg-purple-500/60"></div> Holiday</div>
                             </div>
                         </div>
                     )}